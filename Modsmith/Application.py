@@ -1,25 +1,30 @@
 import argparse
+import cProfile
 import os
 import platform
 import shutil
 import sys
 
-from ctypes import windll
-
 import colorama
 
-from modsmith import (ProjectOptions,
+from modsmith import (GameCache,
+                      ProjectOptions,
                       ProjectSettings,
                       to_version,
                       SimpleLogger as Log,
-                      Packager)
+                      Profiler)
 
 
 class Application:
-    def __init__(self, args: argparse.Namespace) -> None:
+    def __init__(self, args: argparse.Namespace, game_cache: GameCache = None) -> None:
         self.options = ProjectOptions(args)
         self.settings = ProjectSettings(self.options)
         self.debug: bool = self.options.debug
+        self.game_cache: GameCache = game_cache
+
+        # watch mode keeps every vanilla row in memory between rebuilds
+        if self.game_cache is None and self.options.watch:
+            self.game_cache = GameCache(self.settings.cache_path, shared=True)
 
     @staticmethod
     def _try_enable_ansi_colors() -> None:
@@ -32,10 +37,16 @@ class Application:
 
         if sys.platform == 'win32' and platform.release() == '10':
             if to_version(platform.version()) >= to_version('10.0.14393'):
+                from ctypes import windll
+
                 kernel32 = windll.kernel32
                 kernel32.SetConsoleMode(kernel32.GetStdHandle(-11), 7)
 
     def _try_reset_build_path(self) -> None:
+        # incremental builds reuse outputs from the previous build
+        if self.options.incremental:
+            return
+
         if os.path.exists(self.settings.project_build_path):
             shutil.rmtree(self.settings.project_build_path, ignore_errors=True)
             os.makedirs(self.settings.project_build_path, exist_ok=True)
@@ -43,18 +54,47 @@ class Application:
     def run(self) -> int:
         self._try_enable_ansi_colors()
 
+        Profiler.enabled = self.options.profile
+
+        if not self.options.profile_stats:
+            exit_code: int = self._build()
+        else:
+            profile = cProfile.Profile()
+            exit_code = profile.runcall(self._build)
+
+            os.makedirs(os.path.dirname(self.settings.build_profile_stats_path), exist_ok=True)
+            profile.dump_stats(self.settings.build_profile_stats_path)
+
+            Log.info('Wrote profile stats: "%s"' % self.settings.make_project_relative(self.settings.build_profile_stats_path))
+
+        if self.options.profile:
+            Profiler.write_report(self.settings.build_profile_path)
+
+            Log.info('Wrote profile report: "%s"' % self.settings.make_project_relative(self.settings.build_profile_path))
+
+        if self.options.watch and exit_code == 0:
+            from modsmith import ProjectWatcher
+
+            exit_code = ProjectWatcher(self.settings, self.game_cache).run()
+
+        return exit_code
+
+    def _build(self) -> int:
         make_project_relative = self.settings.make_project_relative
 
         if not self.options.config_path:
             Log.error('Cannot proceed because "kingdomcome.yaml" was not found')
             return 1
 
-        packager: Packager = Packager(self.settings)
-
         if not os.path.exists(self.settings.project_manifest_path):
             Log.error('Cannot proceed because "mod.manifest" was not found in project root')
             return 1
 
+        # imported on first build, because the packager loads the patcher and lxml
+        from modsmith import Packager
+
+        packager: Packager = Packager(self.settings, self.game_cache)
+
         self._try_reset_build_path()
 
         # create pak, if project has game data
@@ -62,7 +102,8 @@ class Application:
             Log.info('Started building package...',
                      prefix=os.linesep)
 
-            packager.generate_pak()
+            with Profiler.measure('generate_pak'):
+                packager.generate_pak()
 
             Log.info('PAK generation completed.',
                      prefix=os.linesep)
@@ -75,7 +116,8 @@ class Application:
             Log.info('Started building localization...',
                      prefix=os.linesep)
 
-            packager.generate_i18n()
+            with Profiler.measure('generate_i18n'):
+                packager.generate_i18n()
 
             Log.info('i18n generation completed.',
                      prefix=os.linesep)
@@ -88,7 +130,8 @@ class Application:
             Log.info('Started building ZIP archive...',
                      prefix=os.linesep)
 
-            output_path: str = packager.pack()
+            with Profiler.measure('pack'):
+                output_path: str = packager.pack()
 
             Log.info('ZIP generation completed. File path: "%s"' % make_project_relative(output_path),
                      prefix=os.linesep)
@@ -0,0 +1,127 @@
+import argparse
+import copy
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from modsmith import (GameCache,
+                      GamePathResolver,
+                      SimpleLogger as Log,
+                      get_user_cache_path)
+from modsmith.Application import Application
+
+
+class BatchApplication:
+    MANIFEST_FILE_NAME: str = 'mod.manifest'
+
+    def __init__(self, args: argparse.Namespace, manifest_paths: List[str]) -> None:
+        """
+        Builds several projects in one process, sharing the game config and vanilla table indexes
+        :param args: Parsed arguments, applied to every project
+        :param manifest_paths: Paths to mod.manifest in each project root
+        """
+        self.args: argparse.Namespace = args
+        self.manifest_paths: List[str] = manifest_paths
+
+    @staticmethod
+    def find_manifests(paths: List[str]) -> List[str]:
+        """Returns manifest paths for paths to manifests, project roots, or folders of project roots"""
+        manifest_paths: List[str] = []
+
+        for path in paths:
+            if not os.path.isdir(path):
+                manifest_paths.append(path)
+                continue
+
+            manifest_path: str = os.path.join(path, BatchApplication.MANIFEST_FILE_NAME)
+
+            if os.path.isfile(manifest_path):
+                manifest_paths.append(manifest_path)
+                continue
+
+            for entry in sorted(os.scandir(path), key=lambda e: e.name.casefold()):
+                manifest_path = os.path.join(entry.path, BatchApplication.MANIFEST_FILE_NAME)
+
+                if entry.is_dir() and os.path.isfile(manifest_path):
+                    manifest_paths.append(manifest_path)
+
+        return manifest_paths
+
+    def _build_project(self, manifest_path: str, game_cache: GameCache) -> tuple:
+        """Builds one project. Returns (log lines, exit code, elapsed seconds)."""
+        args: argparse.Namespace = copy.copy(self.args)
+        args.manifest_path = [manifest_path]
+
+        started: float = time.perf_counter()
+
+        with Log.capture() as lines:
+            try:
+                exit_code: int = Application(args, game_cache)._build()
+            except Exception as e:
+                Log.error(f'Failed to build project: {e!r}')
+                exit_code = 1
+
+        return lines, exit_code, time.perf_counter() - started
+
+    def run(self) -> int:
+        Application._try_enable_ansi_colors()
+
+        if self.args.profile or self.args.profile_stats:
+            Log.warn('Profiling is not supported in batch mode. Build projects separately to profile them.')
+            self.args.profile = self.args.profile_stats = False
+
+        if self.args.watch:
+            Log.warn('Watch mode is not supported in batch mode. Build projects separately to watch them.')
+            self.args.watch = False
+
+        # resolve once, so projects do not each search for the game
+        try:
+            self.args.game_path = GamePathResolver(self.args.game_path).resolve()
+        except FileNotFoundError as e:
+            Log.error(str(e))
+            return 1
+
+        # kingdomcome.yaml is loaded by the first project and reused by the rest, see GameConfig.load
+
+        # shared indexes hold every vanilla row, because projects patch different rows of the same tables
+        cache_path: str = '' if self.args.no_cache else os.path.join(get_user_cache_path(), 'tables')
+        game_cache: GameCache = GameCache(cache_path, shared=True)
+
+        jobs: int = min(self.args.parallel or os.cpu_count() or 1, len(self.manifest_paths))
+
+        Log.info(f'Building {len(self.manifest_paths)} projects with {jobs} threads...')
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures: list = [executor.submit(self._build_project, manifest_path, game_cache)
+                             for manifest_path in self.manifest_paths]
+
+            # logs are replayed in input order, as each project finishes
+            results: list = []
+
+            for manifest_path, future in zip(self.manifest_paths, futures):
+                lines, exit_code, elapsed = future.result()
+
+                Log.info(f'Project: "{manifest_path}"', prefix=os.linesep)
+                Log.write(lines)
+
+                results.append((manifest_path, exit_code, elapsed))
+
+        Log.info('Batch summary:', prefix=os.linesep)
+
+        for manifest_path, exit_code, elapsed in results:
+            project_name: str = os.path.basename(os.path.dirname(os.path.abspath(manifest_path)))
+
+            if exit_code == 0:
+                Log.info(f'{project_name}: succeeded in {elapsed:.2f}s', prefix='\t')
+            else:
+                Log.error(f'{project_name}: failed in {elapsed:.2f}s', prefix='\t')
+
+        failed_count: int = sum(1 for _, exit_code, _ in results if exit_code != 0)
+
+        if failed_count:
+            Log.error(f'{failed_count} of {len(results)} projects failed.', prefix=os.linesep)
+            return 1
+
+        Log.info(f'{len(results)} projects built.', prefix=os.linesep)
+        return 0
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import time
+
+from modsmith import SimpleLogger as Log
+
+
+class BuildManifest:
+    # bump when the layout of manifest entries changes
+    VERSION: int = 1
+
+    def __init__(self, manifest_path: str, build_path: str) -> None:
+        """
+        Records the inputs of each patched file so unchanged files can reuse their previous output
+        :param manifest_path: Path to JSON manifest file
+        :param build_path: Folder that output paths are relative to
+        """
+        self.manifest_path: str = manifest_path
+        self.build_path: str = build_path
+        self.entries: dict = {}
+
+        # CRC32s of files packed into PAKs, keyed by path, with the stamp of the file they were read from
+        self.file_crcs: dict = {}
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        sha256 = hashlib.sha256()
+
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha256.update(chunk)
+
+        return sha256.hexdigest()
+
+    @staticmethod
+    def make_fingerprint(file_path: str, game_crc: int, signature: tuple, diff_version: int) -> dict:
+        """
+        Returns the inputs that determine the patched output of a file
+        :param diff_version: Version of the rules rows are diffed by, so outputs diffed under other rules are rebuilt
+        """
+        return {
+            'hash'     : BuildManifest.hash_file(file_path),
+            'crc'      : game_crc,
+            'signature': json.loads(json.dumps(signature)),
+            'diff'     : diff_version
+        }
+
+    @staticmethod
+    def make_stamp(file_path: str) -> list:
+        """
+        Returns the size and times of a file. The change time is set by the file system whenever a file is written,
+        copied or restored, so unlike the modified time it cannot go back to a value it had before.
+        """
+        stat: os.stat_result = os.stat(file_path)
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns]
+
+    def load(self) -> None:
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                data: dict = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+            self.file_crcs = {}
+            return
+
+        if data.get('version') != self.VERSION:
+            data = {}
+
+        self.entries = data.get('entries', {})
+        self.file_crcs = data.get('file_crcs', {})
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'entries': self.entries, 'file_crcs': self.file_crcs}, f,
+                      indent=2, sort_keys=True)
+
+    def is_current(self, key: str, fingerprint: dict, output_path: str) -> bool:
+        """Returns True if key was built from the same inputs and its output still exists"""
+        entry: dict = self.entries.get(key)
+
+        if not entry or entry['fingerprint'] != fingerprint:
+            return False
+
+        return os.path.normcase(entry['output']) == os.path.normcase(os.path.relpath(output_path, self.build_path)) \
+            and os.path.isfile(output_path)
+
+    def update(self, key: str, fingerprint: dict, output_path: str) -> None:
+        self.entries[key] = {
+            'fingerprint': fingerprint,
+            'output'     : os.path.relpath(output_path, self.build_path)
+        }
+
+    def get_file_crc(self, file_path: str, stamp: list) -> int:
+        """Returns the CRC32 recorded for a file, or None if it was not recorded or the file changed since"""
+        entry: dict = self.file_crcs.get(os.path.normcase(os.path.abspath(file_path)))
+
+        return entry['crc'] if entry and entry['stamp'] == stamp else None
+
+    def update_file_crc(self, file_path: str, stamp: list, crc: int) -> None:
+        # a write within the same clock tick as the stamp would not change it, so recently changed files are not recorded
+        if time.time_ns() - max(stamp[1:]) < 2_000_000_000:
+            return
+
+        self.file_crcs[os.path.normcase(os.path.abspath(file_path))] = {'stamp': stamp, 'crc': crc}
+
+    def prune(self, prefix: str, keys: set) -> None:
+        """Removes entries under prefix that are not in keys, and deletes their outputs"""
+        for key in [k for k in self.entries if k.startswith(prefix) and k not in keys]:
+            output_path = os.path.join(self.build_path, self.entries.pop(key)['output'])
+
+            if os.path.isfile(output_path):
+                os.remove(output_path)
+                Log.info(f'Removed stale file: "{output_path}"')
@@ -1,4 +1,6 @@
+import os
 import posixpath
+import sys
 
 
 def fix_slashes(string: str) -> str:
@@ -8,6 +10,24 @@ def fix_slashes(string: str) -> str:
     return string
 
 
+def get_user_cache_path() -> str:
+    """Return path to per-user cache folder for modsmith"""
+    if sys.platform == 'win32':
+        root = os.environ.get('LOCALAPPDATA') or os.path.expanduser(r'~\AppData\Local')
+    else:
+        root = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(root, 'modsmith')
+
+
+def get_user_config_path() -> str:
+    """Return path to per-user config folder for modsmith"""
+    if sys.platform == 'win32':
+        root = os.environ.get('APPDATA') or os.path.expanduser(r'~\AppData\Roaming')
+    else:
+        root = os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+    return os.path.join(root, 'modsmith')
+
+
 def to_version(text) -> tuple:
     filled = []
     for dot in text.split('.'):
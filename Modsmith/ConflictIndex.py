@@ -0,0 +1,179 @@
+import argparse
+import copy
+import hashlib
+import os
+import pickle
+import threading
+from typing import List
+
+from modsmith import (GameCache,
+                      GamePathResolver,
+                      Patcher,
+                      ProjectInventory,
+                      ProjectOptions,
+                      ProjectSettings,
+                      SimpleLogger as Log,
+                      get_user_cache_path)
+
+
+class ConflictIndex:
+    # bump when the layout of project records changes
+    VERSION: int = 2
+
+    def __init__(self, args: argparse.Namespace, manifest_paths: List[str]) -> None:
+        """
+        Finds table rows and attributes patched by more than one project, reusing what each project patched last time
+        :param args: Parsed arguments, applied to every project
+        :param manifest_paths: Paths to mod.manifest in each project root
+        """
+        self.args: argparse.Namespace = args
+        self.manifest_paths: List[str] = manifest_paths
+
+        # records of the rows patched by each project, or empty to scan every project file each time
+        self.index_path: str = '' if args.no_cache else os.path.join(get_user_cache_path(), 'conflicts')
+
+    def _get_record_file_path(self, project_path: str) -> str:
+        key: str = os.path.normcase(os.path.abspath(project_path))
+        digest: str = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.index_path, digest + '.pickle')
+
+    @staticmethod
+    def _get_record_inputs(settings: ProjectSettings) -> tuple:
+        """Returns the inputs shared by every file of a record, so records are rescanned when the diff rules or config change"""
+        return Patcher.DIFF_VERSION, settings.config.digest
+
+    def _read_record(self, project_path: str, inputs: tuple) -> dict:
+        """Returns (stamp, game pak member, patched attributes) tuples keyed by project relative path"""
+        if not self.index_path:
+            return {}
+
+        try:
+            with open(self._get_record_file_path(project_path), 'rb') as f:
+                version, record_inputs, record = pickle.load(f)
+        except (OSError, EOFError, ValueError, TypeError, pickle.PickleError):
+            return {}
+
+        return record if version == self.VERSION and record_inputs == inputs else {}
+
+    def _write_record(self, project_path: str, inputs: tuple, record: dict) -> None:
+        record_file_path: str = self._get_record_file_path(project_path)
+        temp_file_path = f'{record_file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+        try:
+            os.makedirs(self.index_path, exist_ok=True)
+
+            with open(temp_file_path, 'wb') as f:
+                pickle.dump((self.VERSION, inputs, record), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(temp_file_path, record_file_path)
+        except OSError as e:
+            Log.warn(f'Cannot write conflict index: "{record_file_path}" ({e})', prefix='\t')
+
+    def _scan_project(self, settings: ProjectSettings, game_cache: GameCache) -> dict:
+        """Returns the record of a project, scanning only files changed since the project was last scanned"""
+        inputs: tuple = self._get_record_inputs(settings)
+
+        previous_record: dict = self._read_record(settings.project_path, inputs)
+        record: dict = {}
+
+        patcher: Patcher = Patcher(settings, game_cache)
+        scanned_count: int = 0
+
+        try:
+            for entry in ProjectInventory(settings).entries:
+                if entry.kind != ProjectInventory.DATA_XML:
+                    continue
+
+                pak_file_name: str = settings.config.find_package(entry.relative_path)
+
+                if pak_file_name is None:
+                    continue
+
+                try:
+                    # files are rescanned when they change, or when the game member they patch changes
+                    stamp: tuple = (entry.size, entry.mtime_ns, patcher.get_game_crc(entry.path))
+
+                    previous: tuple = previous_record.get(entry.relative_path)
+
+                    if previous and previous[0] == stamp:
+                        record[entry.relative_path] = previous
+                        continue
+
+                    game_pak_arcname, patched_attributes = patcher.find_patched_attributes(entry.path)
+                except Exception as e:
+                    Log.error(f'Cannot scan "{entry.relative_path}": {e!r}', prefix='\t')
+                    continue
+
+                record[entry.relative_path] = (stamp, game_pak_arcname, patched_attributes)
+                scanned_count += 1
+        finally:
+            patcher.close()
+
+        Log.info(f'Scanned {scanned_count} of {len(record)} table files.', prefix='\t')
+
+        if self.index_path and record != previous_record:
+            self._write_record(settings.project_path, inputs, record)
+
+        return record
+
+    @staticmethod
+    def find_conflicts(records: dict) -> dict:
+        """
+        Returns keys of projects patching each (game pak member, signature key, attribute) patched by more than one
+        :param records: Records keyed by project, see _scan_project
+        """
+        patched_by: dict = {}
+
+        for project_key, record in records.items():
+            for _, game_pak_arcname, patched_attributes in record.values():
+                for key, attributes in patched_attributes.items():
+                    for attribute in attributes:
+                        project_keys: list = patched_by.setdefault((game_pak_arcname, key, attribute), [])
+
+                        # a project may patch the same row in more than one file
+                        if project_key not in project_keys:
+                            project_keys.append(project_key)
+
+        return {index_key: project_keys for index_key, project_keys in patched_by.items() if len(project_keys) > 1}
+
+    def run(self) -> int:
+        # resolve once, so projects do not each search for the game
+        try:
+            self.args.game_path = GamePathResolver(self.args.game_path).resolve()
+        except FileNotFoundError as e:
+            Log.error(str(e))
+            return 1
+
+        cache_path: str = '' if self.args.no_cache else os.path.join(get_user_cache_path(), 'tables')
+        game_cache: GameCache = GameCache(cache_path, shared=True)
+
+        # projects are keyed by manifest path, as projects in different folders may have the same folder name
+        records: dict = {}
+        project_paths: dict = {}
+
+        for manifest_path in self.manifest_paths:
+            args: argparse.Namespace = copy.copy(self.args)
+            args.manifest_path = [manifest_path]
+
+            settings: ProjectSettings = ProjectSettings(ProjectOptions(args))
+
+            Log.info(f'Scanning project: "{manifest_path}"')
+
+            project_key: str = os.path.normcase(os.path.abspath(manifest_path))
+
+            records[project_key] = self._scan_project(settings, game_cache)
+            project_paths[project_key] = settings.project_path
+
+        conflicts: dict = self.find_conflicts(records)
+
+        if not conflicts:
+            Log.info(f'No conflicts found in {len(records)} projects.', prefix=os.linesep)
+            return 0
+
+        Log.warn(f'Found {len(conflicts)} attributes patched by more than one project:', prefix=os.linesep)
+
+        for (game_pak_arcname, key, attribute), project_keys in sorted(conflicts.items()):
+            project_names: list = [f'"{project_paths[project_key]}"' for project_key in project_keys]
+            Log.warn(f'{game_pak_arcname} [{", ".join(key)}] {attribute}: {", ".join(project_names)}', prefix='\t')
+
+        return 1
@@ -1,6 +1,13 @@
+import io
+import mmap
+import shutil
 import struct
+from typing import IO
 
 from zipfile import (BadZipFile,
+                     LargeZipFile,
+                     ZIP64_LIMIT,
+                     ZIP_STORED,
                      ZipExtFile,
                      ZipFile,
                      ZipInfo,
@@ -10,8 +17,94 @@ from zipfile import (BadZipFile,
                      structFileHeader)
 
 
+class _RawMemberFile(io.RawIOBase):
+    def __init__(self, fp: IO, offset: int, size: int) -> None:
+        """Reads the compressed data of a member from an archive file object shared with other readers"""
+        self._fp: IO = fp
+        self._position: int = offset
+        self._remaining: int = size
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+
+        self._fp.seek(self._position)
+        data: bytes = self._fp.read(size)
+
+        self._position += len(data)
+        self._remaining -= len(data)
+        return data
+
+
+class _MappedMemberFile(io.RawIOBase):
+    def __init__(self, mapping: mmap.mmap, offset: int, size: int) -> None:
+        """Reads the data of a member from a memory map of an archive, without seeking a shared file object"""
+        self._mapping: mmap.mmap = mapping
+        self._end: int = offset + size
+        self._position: int = offset
+
+    def readable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        # the map can only be closed once no member holds a view into it
+        self._mapping = None
+        super().close()
+
+    def read(self, size: int = -1) -> bytes:
+        if self._mapping is None:
+            raise ValueError('I/O operation on closed file.')
+
+        end: int = self._end if size < 0 else min(self._position + size, self._end)
+
+        data: bytes = self._mapping[self._position:end]
+        self._position = end
+        return data
+
+    def readinto(self, buffer: bytearray) -> int:
+        if self._mapping is None:
+            raise ValueError('I/O operation on closed file.')
+
+        end: int = min(self._position + len(buffer), self._end)
+        size: int = end - self._position
+
+        # the view is released before returning, so the map is not held open between reads
+        with memoryview(self._mapping) as mapping_view:
+            memoryview(buffer)[:size] = mapping_view[self._position:end]
+        self._position = end
+        return size
+
+
 # noinspection Mypy
 class ZipFileFixed(ZipFile):
+    @staticmethod
+    def _get_data_offset(zinfo: ZipInfo, fheader: bytes) -> int:
+        if len(fheader) != sizeFileHeader:
+            raise BadZipFile('Truncated file header')
+
+        fheader = struct.unpack(structFileHeader, fheader)
+        if fheader[0] != stringFileHeader:
+            raise BadZipFile('Bad magic number for file header')
+
+        return zinfo.header_offset + sizeFileHeader + fheader[10] + fheader[11]
+
+    @staticmethod
+    def open_member(mapping: mmap.mmap, zinfo: ZipInfo) -> IO:
+        """
+        Opens a member of a memory-mapped archive by the header offset, sizes and compress type in zinfo, so several
+        threads can read without a lock. Stored members are read straight from the map, and deflated members are
+        inflated as they are read.
+        """
+        data_offset: int = ZipFileFixed._get_data_offset(zinfo, mapping[zinfo.header_offset:zinfo.header_offset + sizeFileHeader])
+
+        if zinfo.compress_type == ZIP_STORED:
+            return _MappedMemberFile(mapping, data_offset, zinfo.file_size)
+
+        return ZipExtFile(_MappedMemberFile(mapping, data_offset, zinfo.compress_size), 'r', zinfo, None, True)
+
     def open(self, name: str, mode: str = 'r', pwd: bytes = None, *, force_zip64: bool = False) -> ZipExtFile:
         if not self.fp:
             raise ValueError('Attempt to use ZIP archive that was already closed')
@@ -54,3 +147,43 @@ class ZipFileFixed(ZipFile):
         except:
             zef_file.close()
             raise
+
+    def open_raw(self, zinfo: ZipInfo) -> IO:
+        """Opens the compressed data of a member, e.g. to copy it to another archive with write_raw"""
+        if not self.fp:
+            raise ValueError('Attempt to use ZIP archive that was already closed')
+
+        self.fp.seek(zinfo.header_offset)
+
+        data_offset: int = self._get_data_offset(zinfo, self.fp.read(sizeFileHeader))
+        return _RawMemberFile(self.fp, data_offset, zinfo.compress_size)
+
+    def write_raw(self, zinfo: ZipInfo, source: IO) -> None:
+        """Writes a member from data that is already compressed. zinfo must have its compress type, CRC and sizes set."""
+        if self._writing:
+            raise ValueError("Can't write to the ZIP file while there is "
+                             "another write handle open on it. "
+                             "Close the first handle before opening another.")
+
+        zip64 = zinfo.file_size > ZIP64_LIMIT or zinfo.compress_size > ZIP64_LIMIT
+        if zip64 and not self._allowZip64:
+            raise LargeZipFile('Filesize would require ZIP64 extensions')
+
+        if not zinfo.external_attr:
+            zinfo.external_attr = 0o600 << 16
+
+        zinfo.flag_bits = 0x00
+
+        if self._seekable:
+            self.fp.seek(self.start_dir)
+        zinfo.header_offset = self.fp.tell()
+
+        self._writecheck(zinfo)
+        self._didModify = True
+
+        self.fp.write(zinfo.FileHeader(zip64))
+        shutil.copyfileobj(source, self.fp, 1024 * 1024)
+
+        self.start_dir = self.fp.tell()
+        self.filelist.append(zinfo)
+        self.NameToInfo[zinfo.filename] = zinfo
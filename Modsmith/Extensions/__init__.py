@@ -1,2 +1,6 @@
-from modsmith.Extensions.HelpFormatterEx import HelpFormatterEx
-from modsmith.Extensions.ZipFileFixed import ZipFileFixed
+from modsmith import _export_lazily
+
+_export_lazily(__name__, {
+    'HelpFormatterEx': 'modsmith.Extensions.HelpFormatterEx',
+    'ZipFileFixed'   : 'modsmith.Extensions.ZipFileFixed'
+})
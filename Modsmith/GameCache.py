@@ -0,0 +1,144 @@
+import hashlib
+import os
+import pickle
+import threading
+from typing import (Callable,
+                    IO,
+                    Iterable)
+
+from modsmith import (GamePak,
+                      SharedIndex,
+                      SimpleLogger as Log)
+
+
+class GameCache:
+    # bump when the layout of cached indexes changes
+    VERSION: int = 2
+
+    def __init__(self, cache_path: str = '', shared: bool = False, published: dict = None) -> None:
+        """
+        Stores vanilla game tables packed into indexes in memory and, when cache_path is set, on disk
+        :param cache_path: Folder for persisted indexes, or empty to only cache in memory
+        :param shared: Whether indexes are shared by several projects, and so must index every row
+        :param published: Shared memory block names of indexes published by another process, see publish
+        """
+        self.cache_path: str = cache_path
+        self.shared: bool = shared
+        self.published: dict = published or {}
+        self.memory: dict = {}
+        self._lock = threading.Lock()
+
+        # indexes are built by one thread at a time, so concurrent builds don't index the same member twice
+        self._key_locks: dict = {}
+
+    @staticmethod
+    def get_stamp(game_pak: GamePak, arcname: str) -> tuple:
+        """Returns the (size, mtime, member CRC) tuple used to invalidate cached indexes"""
+        return game_pak.stamp + (game_pak.getinfo(arcname).CRC,)
+
+    def _get_cache_file_path(self, key: tuple) -> str:
+        digest: str = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_path, digest[:2], digest + '.index')
+
+    def _read(self, key: tuple, stamp: tuple) -> SharedIndex:
+        """Maps a cached index into memory, or returns None"""
+        cache_file_path = self._get_cache_file_path(key)
+
+        try:
+            with open(cache_file_path, 'rb') as f:
+                version, cached_key, cached_stamp, size = pickle.load(f)
+                offset: int = f.tell()
+
+            if version != self.VERSION or cached_key != key or cached_stamp != stamp:
+                return None
+
+            index = SharedIndex.map_file(cache_file_path, offset, size)
+        except (OSError, EOFError, ValueError, pickle.PickleError):
+            return None
+
+        Log.debug(f'Loaded cached index: "{cache_file_path}"', prefix='\t')
+        return index
+
+    def _write(self, key: tuple, stamp: tuple, buffer: memoryview) -> None:
+        cache_file_path = self._get_cache_file_path(key)
+        temp_file_path = f'{cache_file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+        try:
+            os.makedirs(os.path.dirname(cache_file_path), exist_ok=True)
+
+            # the packed index follows a pickled header, so it can be mapped without being decoded
+            with open(temp_file_path, 'wb') as f:
+                pickle.dump((self.VERSION, key, stamp, len(buffer)), f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.write(buffer)
+
+            os.replace(temp_file_path, cache_file_path)
+        except OSError as e:
+            Log.warn(f'Cannot write cached index: "{cache_file_path}" ({e})', prefix='\t')
+            return
+
+        Log.debug(f'Wrote cached index: "{cache_file_path}"', prefix='\t')
+
+    @staticmethod
+    def get_key(game_pak_path: str, arcname: str, signature: tuple) -> tuple:
+        return os.path.normcase(os.path.abspath(game_pak_path)), arcname, signature
+
+    def publish(self, game_pak: GamePak, game_pak_path: str, arcname: str, signature: tuple,
+                iterate: Callable[[IO], Iterable]) -> tuple:
+        """
+        Copies an index into shared memory, loading it first if needed. Returns (key, stamp, shared memory block),
+        to be passed to other processes as published={key: (stamp, block.name)}. The caller must close and unlink
+        the block once those processes are done with it.
+        """
+        index, _ = self.load(game_pak, game_pak_path, arcname, signature, iterate)
+
+        return (self.get_key(game_pak_path, arcname, signature), self.get_stamp(game_pak, arcname),
+                SharedIndex.publish(index.buffer))
+
+    def load(self, game_pak: GamePak, game_pak_path: str, arcname: str, signature: tuple,
+             iterate: Callable[[IO], Iterable]) -> tuple:
+        """
+        Returns the index of a game pak member and the keys shared by multiple rows, packing it from the (key, value)
+        pairs yielded by iterate only if no valid cached index exists
+        :param game_pak: Open game pak
+        :param game_pak_path: Path to game pak, used to invalidate cached indexes
+        :param arcname: Name of member in game pak
+        :param signature: Signature used by iterate, included in the cache key
+        :param iterate: Callable that yields (key, value) pairs from an open member stream
+        """
+        key = self.get_key(game_pak_path, arcname, signature)
+        stamp = self.get_stamp(game_pak, arcname)
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self.memory and self.memory[key][0] == stamp:
+                    return self.memory[key][1]
+
+            index: SharedIndex = None
+
+            # published indexes are read in place, so processes share one copy
+            if key in self.published and self.published[key][0] == stamp:
+                try:
+                    index = SharedIndex.attach(self.published[key][1])
+                    Log.debug(f'Attached shared index: "{arcname}"', prefix='\t')
+                except (OSError, ValueError):
+                    index = None
+
+            if index is None and self.cache_path:
+                index = self._read(key, stamp)
+
+            if index is None:
+                with game_pak.open_mapped(arcname) as f:
+                    index = SharedIndex(SharedIndex.pack(iterate(f)))
+
+                if self.cache_path:
+                    self._write(key, stamp, index.buffer)
+
+            data: tuple = (index, index.duplicate_keys)
+
+            with self._lock:
+                self.memory[key] = (stamp, data)
+
+            return data
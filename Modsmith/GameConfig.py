@@ -0,0 +1,181 @@
+import hashlib
+import os
+import pickle
+import threading
+from dataclasses import (dataclass,
+                         field)
+from typing import (Any,
+                    Iterable)
+
+from modsmith import SimpleLogger as Log
+
+
+@dataclass
+class GameConfig:
+    # bump when the compiled fields change, so older snapshots are ignored
+    SNAPSHOT_VERSION = 1
+
+    # fields loaded from kingdomcome.yaml or compiled from it, and stored in snapshots
+    SNAPSHOT_FIELDS = ('exclusions', 'localization', 'packages', 'signatures',
+                       'package_trie', 'signature_trie', 'exclusion_trie', 'exclusion_extensions')
+
+    config_path: str = field(init=True, default_factory=lambda: '')
+
+    # folder for compiled snapshots of configs, or empty to always load kingdomcome.yaml
+    snapshot_path: str = field(init=True, default_factory=lambda: '', repr=False)
+
+    exclusions: list = field(init=False, default_factory=list)
+    localization: list = field(init=False, default_factory=list)
+    packages: dict = field(init=False, default_factory=dict)
+    signatures: list = field(init=False, default_factory=list)
+
+    # path segment tries compiled from packages and signatures, see find_package and find_signature
+    package_trie: dict = field(init=False, default_factory=dict, repr=False)
+    signature_trie: dict = field(init=False, default_factory=dict, repr=False)
+
+    # case-insensitive path segment trie and extensions compiled from exclusions, see is_excluded
+    exclusion_trie: dict = field(init=False, default_factory=dict, repr=False)
+    exclusion_extensions: frozenset = field(init=False, default_factory=frozenset, repr=False)
+
+    # SHA-1 of kingdomcome.yaml, so results derived from the config can be invalidated when it changes
+    digest: str = field(init=False, default_factory=lambda: '', repr=False)
+
+    def __post_init__(self) -> None:
+        """Loads the database from a snapshot of kingdomcome.yaml, or from kingdomcome.yaml when no snapshot matches"""
+        with open(self.config_path, mode='rb') as f:
+            data: bytes = f.read()
+
+        # snapshots are keyed by content, so they survive reinstalls that only touch modified times
+        self.digest = digest = hashlib.sha1(data).hexdigest()
+
+        if self.snapshot_path and self._read_snapshot(digest):
+            return
+
+        self._compile(data)
+
+        if self.snapshot_path:
+            self._write_snapshot(digest)
+
+    def _get_snapshot_file_path(self, digest: str) -> str:
+        return os.path.join(self.snapshot_path, digest + '.pickle')
+
+    def _read_snapshot(self, digest: str) -> bool:
+        snapshot_file_path: str = self._get_snapshot_file_path(digest)
+
+        try:
+            with open(snapshot_file_path, 'rb') as f:
+                version, cached_digest, values = pickle.load(f)
+        except (OSError, EOFError, ValueError, pickle.PickleError):
+            return False
+
+        if version != self.SNAPSHOT_VERSION or cached_digest != digest:
+            return False
+
+        for name in self.SNAPSHOT_FIELDS:
+            setattr(self, name, values[name])
+
+        Log.debug(f'Loaded config snapshot: "{snapshot_file_path}"')
+        return True
+
+    def _write_snapshot(self, digest: str) -> None:
+        snapshot_file_path: str = self._get_snapshot_file_path(digest)
+        temp_file_path = f'{snapshot_file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+        values: dict = {name: getattr(self, name) for name in self.SNAPSHOT_FIELDS}
+
+        try:
+            os.makedirs(self.snapshot_path, exist_ok=True)
+
+            with open(temp_file_path, 'wb') as f:
+                pickle.dump((self.SNAPSHOT_VERSION, digest, values), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(temp_file_path, snapshot_file_path)
+        except OSError as e:
+            Log.warn(f'Cannot write config snapshot: "{snapshot_file_path}" ({e})')
+            return
+
+        Log.debug(f'Wrote config snapshot: "{snapshot_file_path}"')
+
+    def _compile(self, data: bytes) -> None:
+        # yaml is only imported when no snapshot matches, because importing and parsing it dominates startup
+        from yaml import (CLoader,
+                          load)
+
+        db: dict = load(data, Loader=CLoader)
+
+        self.exclusions = db['Exclusions']
+        self.localization = db['Localization']
+        self.packages = db['Packages']
+        self.signatures = db['Signatures']
+
+        # exclusions starting with a period are file extensions, and the rest are project relative paths
+        self.exclusion_extensions = frozenset(x.casefold() for x in self.exclusions if x.startswith('.'))
+
+        for path in self.exclusions:
+            if not path.startswith('.'):
+                self._insert(self.exclusion_trie, path.casefold().split('/'), True)
+
+        for path, pak_file_name in self.packages.items():
+            self._insert(self.package_trie, path.split('/'), pak_file_name)
+
+        # signatures are matched by path suffix, so their segments are inserted in reverse
+        for entry in self.signatures:
+            path: str = next(iter(entry))
+            signature: dict = entry[path][0]
+            self._insert(self.signature_trie, reversed(path.split('/')), (signature['element'], signature['attributes']))
+
+    @staticmethod
+    def _insert(trie: dict, segments: Iterable[str], value: Any) -> None:
+        node: dict = trie
+
+        for segment in segments:
+            node = node.setdefault(segment, {})
+
+        # the first entry for a path wins, as when the config was scanned in order
+        node.setdefault(None, value)
+
+    @staticmethod
+    def _find_longest(trie: dict, segments: Iterable[str]) -> Any:
+        node: dict = trie
+        value: Any = None
+
+        for segment in segments:
+            node = node.get(segment)
+
+            if node is None:
+                break
+
+            value = node.get(None, value)
+
+        return value
+
+    def is_excluded(self, path: str) -> bool:
+        """Returns whether a project relative path has an excluded extension, or is in or at an excluded path"""
+        path = path.casefold()
+
+        if os.path.splitext(path)[1] in self.exclusion_extensions:
+            return True
+
+        return self._find_longest(self.exclusion_trie, path.split('/')) is not None
+
+    def find_package(self, path: str) -> str:
+        """Returns PAK file name for the longest package path that prefixes a project relative path, or None"""
+        return self._find_longest(self.package_trie, path.split('/'))
+
+    def find_signature(self, path: str) -> tuple:
+        """Returns (element, attributes) for the longest signature path that suffixes a path, or None"""
+        return self._find_longest(self.signature_trie, reversed(path.split('/')))
+
+    @staticmethod
+    def load(config_path: str, snapshot_path: str = '') -> 'GameConfig':
+        """Returns the config for a path, loading it only once per process"""
+        key: str = os.path.normcase(os.path.abspath(config_path))
+
+        with _loaded_configs_lock:
+            if key not in _loaded_configs:
+                _loaded_configs[key] = GameConfig(config_path, snapshot_path)
+            return _loaded_configs[key]
+
+
+_loaded_configs: dict = {}
+_loaded_configs_lock = threading.Lock()
@@ -0,0 +1,214 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+import weakref
+from array import array
+from bisect import bisect_left
+from typing import IO
+
+from zipfile import ZipInfo
+
+from modsmith import (SimpleLogger as Log,
+                      ZipFileFixed)
+
+
+class GamePakIndex:
+    # bump when the layout of index files changes
+    VERSION: int = 1
+
+    MAGIC: bytes = b'MSPI'
+    HEADER: struct.Struct = struct.Struct('<4sIQQQ')
+
+    def __init__(self, names: list, header_offsets: array, compress_sizes: array, file_sizes: array,
+                 crcs: array, compress_types: array) -> None:
+        """
+        Member table of a game pak, held in sorted names and parallel arrays instead of a ZipInfo per member
+        :param names: Member names, sorted
+        """
+        self.names: list = names
+        self.header_offsets: array = header_offsets
+        self.compress_sizes: array = compress_sizes
+        self.file_sizes: array = file_sizes
+        self.crcs: array = crcs
+        self.compress_types: array = compress_types
+
+    @staticmethod
+    def build(game_pak_path: str) -> 'GamePakIndex':
+        """Builds the member table from the central directory of a game pak"""
+        with ZipFileFixed(game_pak_path, 'r') as zip_file:
+            zinfos: list = sorted(zip_file.infolist(), key=lambda zinfo: zinfo.filename)
+
+        return GamePakIndex([zinfo.filename for zinfo in zinfos],
+                            array('Q', (zinfo.header_offset for zinfo in zinfos)),
+                            array('Q', (zinfo.compress_size for zinfo in zinfos)),
+                            array('Q', (zinfo.file_size for zinfo in zinfos)),
+                            array('I', (zinfo.CRC for zinfo in zinfos)),
+                            array('H', (zinfo.compress_type for zinfo in zinfos)))
+
+    @staticmethod
+    def read(index_file_path: str, stamp: tuple) -> 'GamePakIndex':
+        """Reads a member table written for a game pak with the same (size, mtime) stamp, or returns None"""
+        try:
+            with open(index_file_path, 'rb') as f:
+                magic, version, size, mtime_ns, count = GamePakIndex.HEADER.unpack(f.read(GamePakIndex.HEADER.size))
+
+                if magic != GamePakIndex.MAGIC or version != GamePakIndex.VERSION or (size, mtime_ns) != stamp:
+                    return None
+
+                names_size, = struct.unpack('<Q', f.read(8))
+                names: list = f.read(names_size).decode('utf-8').split('\0') if count else []
+
+                arrays: list = []
+
+                for typecode in ('Q', 'Q', 'Q', 'I', 'H'):
+                    values = array(typecode)
+                    values.fromfile(f, count)
+                    arrays.append(values)
+        except (OSError, EOFError, ValueError, struct.error):
+            return None
+
+        if sys.byteorder != 'little':
+            for values in arrays:
+                values.byteswap()
+
+        return GamePakIndex(names, *arrays)
+
+    def write(self, index_file_path: str, stamp: tuple) -> None:
+        temp_file_path = f'{index_file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        names: bytes = '\0'.join(self.names).encode('utf-8')
+
+        arrays: list = [self.header_offsets, self.compress_sizes, self.file_sizes, self.crcs, self.compress_types]
+
+        # index files are little-endian, like the archives they describe
+        if sys.byteorder != 'little':
+            arrays = [array(values.typecode, values) for values in arrays]
+            for values in arrays:
+                values.byteswap()
+
+        try:
+            os.makedirs(os.path.dirname(index_file_path), exist_ok=True)
+
+            with open(temp_file_path, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.VERSION, stamp[0], stamp[1], len(self.names)))
+                f.write(struct.pack('<Q', len(names)))
+                f.write(names)
+
+                for values in arrays:
+                    values.tofile(f)
+
+            os.replace(temp_file_path, index_file_path)
+        except OSError as e:
+            Log.warn(f'Cannot write game pak index: "{index_file_path}" ({e})', prefix='\t')
+            return
+
+        Log.debug(f'Wrote game pak index: "{index_file_path}"', prefix='\t')
+
+    def find(self, name: str) -> int:
+        """Returns the position of a member in the arrays, or -1"""
+        i: int = bisect_left(self.names, name)
+        return i if i < len(self.names) and self.names[i] == name else -1
+
+
+class GamePak:
+    def __init__(self, game_pak_path: str, index_path: str = '') -> None:
+        """
+        Reads members of a game pak by offset, using a member table cached in memory and, when index_path is set, on disk
+        :param game_pak_path: Path to game pak
+        :param index_path: Folder for persisted member tables, or empty to only cache in memory
+        """
+        self.game_pak_path: str = game_pak_path
+        self.index_path: str = index_path
+
+        stat = os.stat(game_pak_path)
+        self.stamp: tuple = (stat.st_size, stat.st_mtime_ns)
+
+        self.index: GamePakIndex = self._load_index()
+
+        self._file: IO = None
+        self._mapping: mmap.mmap = None
+        self._mapping_lock = threading.Lock()
+
+        # members opened from the map, which are closed before the map is
+        self._member_files: weakref.WeakSet = weakref.WeakSet()
+
+    def _get_index_file_path(self) -> str:
+        key: str = os.path.normcase(os.path.abspath(self.game_pak_path))
+        digest: str = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.index_path, digest + '.index')
+
+    def _load_index(self) -> GamePakIndex:
+        key: tuple = (os.path.normcase(os.path.abspath(self.game_pak_path)), self.stamp)
+
+        with _loaded_indexes_lock:
+            if key in _loaded_indexes:
+                return _loaded_indexes[key]
+
+        index: GamePakIndex = None
+
+        if self.index_path:
+            index = GamePakIndex.read(self._get_index_file_path(), self.stamp)
+
+        if index is None:
+            index = GamePakIndex.build(self.game_pak_path)
+
+            if self.index_path:
+                index.write(self._get_index_file_path(), self.stamp)
+
+        with _loaded_indexes_lock:
+            _loaded_indexes[key] = index
+
+        return index
+
+    def getinfo(self, name: str) -> ZipInfo:
+        """Returns a ZipInfo for one member. Raises KeyError if the member does not exist, like ZipFile.getinfo."""
+        i: int = self.index.find(name)
+
+        if i < 0:
+            raise KeyError(f'There is no item named {name!r} in the archive')
+
+        zinfo = ZipInfo(name)
+        zinfo.header_offset = self.index.header_offsets[i]
+        zinfo.compress_size = self.index.compress_sizes[i]
+        zinfo.file_size = self.index.file_sizes[i]
+        zinfo.CRC = self.index.crcs[i]
+        zinfo.compress_type = self.index.compress_types[i]
+        return zinfo
+
+    def _get_mapping(self) -> mmap.mmap:
+        with self._mapping_lock:
+            if self._mapping is None:
+                self._file = open(self.game_pak_path, 'rb')
+                self._mapping = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mapping
+
+    def open_mapped(self, name: str) -> IO:
+        """Opens a member for reading from a memory map of the game pak, see ZipFileFixed.open_member"""
+        member_file: IO = ZipFileFixed.open_member(self._get_mapping(), self.getinfo(name))
+        self._member_files.add(member_file)
+        return member_file
+
+    def close(self) -> None:
+        """Closes members still open for reading, and the memory map of the game pak"""
+        with self._mapping_lock:
+            for member_file in list(self._member_files):
+                member_file.close()
+
+            if self._mapping is not None:
+                try:
+                    self._mapping.close()
+                except BufferError:
+                    # a member is being read on another thread, and the map is unmapped once the read drops it
+                    Log.debug(f'Game pak still mapped while a member is read: "{self.game_pak_path}"', prefix='\t')
+                self._mapping = None
+
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+# member tables are shared by every game pak reader in the process
+_loaded_indexes: dict = {}
+_loaded_indexes_lock = threading.Lock()
@@ -0,0 +1,90 @@
+import json
+import os
+from typing import (Callable,
+                    List)
+
+from modsmith import (Registry,
+                      SimpleLogger as Log,
+                      get_user_config_path)
+
+
+class GamePathResolver:
+    ENVIRONMENT_VARIABLE: str = 'MODSMITH_GAME_PATH'
+
+    def __init__(self, game_path: str = '', config_file_path: str = '') -> None:
+        """
+        Resolves the installed path for the game from the first resolver that returns a path
+        :param game_path: Explicit path to game install, e.g. from --game-path
+        :param config_file_path: Path to user config file that caches the resolved path
+        """
+        self.game_path: str = game_path
+        self.config_file_path: str = config_file_path or os.path.join(get_user_config_path(), 'config.json')
+
+        # resolvers are tried in order and return an empty string when they cannot resolve a path
+        self.resolvers: List[Callable[[], str]] = [
+            self._resolve_from_argument,
+            self._resolve_from_environment,
+            self._resolve_from_config,
+            self._resolve_from_registry
+        ]
+
+    @staticmethod
+    def _validate(game_path: str, source: str) -> str:
+        if not os.path.isdir(game_path):
+            raise FileNotFoundError(f'Cannot find game path from {source}: "{game_path}"')
+        return game_path
+
+    def _resolve_from_argument(self) -> str:
+        return self._validate(self.game_path, 'argument') if self.game_path else ''
+
+    def _resolve_from_environment(self) -> str:
+        game_path: str = os.environ.get(self.ENVIRONMENT_VARIABLE, '')
+        return self._validate(game_path, self.ENVIRONMENT_VARIABLE) if game_path else ''
+
+    def _read_config(self) -> dict:
+        try:
+            with open(self.config_file_path, encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        return config if isinstance(config, dict) else {}
+
+    def _resolve_from_config(self) -> str:
+        game_path: str = self._read_config().get('game_path', '')
+
+        # ignore cached paths to uninstalled or moved games
+        if game_path and not os.path.isdir(game_path):
+            Log.debug(f'Ignoring cached game path: "{game_path}"')
+            return ''
+
+        return game_path
+
+    def _resolve_from_registry(self) -> str:
+        try:
+            game_path: str = Registry.get_installed_path()
+        except FileNotFoundError:
+            return ''
+
+        config: dict = self._read_config()
+        config['game_path'] = game_path
+
+        try:
+            os.makedirs(os.path.dirname(self.config_file_path), exist_ok=True)
+
+            with open(self.config_file_path, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=2)
+        except OSError as e:
+            Log.warn(f'Cannot cache game path: "{self.config_file_path}" ({e})')
+
+        return game_path
+
+    def resolve(self) -> str:
+        """Returns installed path for game. Raises FileNotFoundError if the installed path cannot be found."""
+        for resolver in self.resolvers:
+            game_path: str = resolver()
+
+            if game_path:
+                return game_path
+
+        raise FileNotFoundError(f'Cannot find installed path for game. Pass --game-path or set {self.ENVIRONMENT_VARIABLE}.')
@@ -1,31 +1,59 @@
 import fnmatch
 import glob
+import io
+import itertools
 import operator
 import os
 import shutil
+import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from functools import reduce
-from typing import Generator
-from zipfile import (ZIP_DEFLATED,
-                     ZIP_STORED)
+from typing import (IO,
+                    Callable,
+                    Generator)
+from zipfile import (BadZipFile,
+                     ZIP64_LIMIT,
+                     ZIP_DEFLATED,
+                     ZIP_STORED,
+                     ZipInfo)
 
 from lxml import etree
 
-from modsmith import (PRECOMPILED_XPATH_ROW,
-                      XML_PARSER,
+from modsmith import (BuildManifest,
+                      GameCache,
                       Patcher,
+                      Profiler,
+                      ProjectInventory,
                       ProjectSettings,
                       SimpleLogger as Log,
-                      ZipFileFixed)
+                      ZipFileFixed,
+                      fix_slashes)
 
 
 class Packager:
-    def __init__(self, settings: ProjectSettings) -> None:
+    # PAK and ZIP members have a fixed timestamp and mode, so unchanged builds produce identical archives
+    ZIP_DATE_TIME: tuple = (1980, 1, 1, 0, 0, 0)
+    ZIP_EXTERNAL_ATTR: int = 0o644 << 16
+
+    # names of the row elements merged into localization tables, matched like PRECOMPILED_XPATH_ROW
+    I18N_ROW_TAGS: tuple = ('Row', 'row')
+
+    def __init__(self, settings: ProjectSettings, game_cache: GameCache = None) -> None:
         self.settings: ProjectSettings = settings
         self.sep = '-' * 80
 
-        self.project_glob_all = os.path.join(self.settings.project_data_path, r'**\*')
-        self.project_glob_paks: str = os.path.join(self.settings.project_path, r'**\*.pak')
-        self.build_glob_paks: str = os.path.join(self.settings.build_zip_folder_path, r'**\*.pak')
+        # project files are listed once, and shared by every packaging stage
+        self.inventory: ProjectInventory = ProjectInventory(self.settings)
+
+        # vanilla indexes are shared by data and localization patching, and by other projects in a batch
+        self.game_cache: GameCache = game_cache or GameCache(self.settings.cache_path)
+
+        self.build_manifest: BuildManifest = None
+
+        if self.settings.options.incremental:
+            self.build_manifest = BuildManifest(self.settings.build_manifest_path, self.settings.project_build_path)
+            self.build_manifest.load()
 
     @staticmethod
     def _copy_assets_to_build_path(xml_files: list, build_lang_path: str, excluded_files: list) -> None:
@@ -49,75 +77,214 @@ class Packager:
 
         xml_files: list = []
 
-        for folder in folders:
-            for f in glob.iglob(os.path.join(self.settings.project_i18n_path, folder, '*.xml'), recursive=False):
-                os.makedirs(os.path.join(self.settings.build_localization_path, folder), exist_ok=True)
-                xml_files.append(f)
+        for entry in self.inventory.entries:
+            if entry.kind != ProjectInventory.I18N_XML:
+                continue
+
+            folder: str = entry.relative_path.split('/')[1]
+
+            if folder in folders:
+                if self.settings.options.keep_build_tree:
+                    os.makedirs(os.path.join(self.settings.build_localization_path, folder), exist_ok=True)
+                xml_files.append(entry.path)
 
         return xml_files
 
     def _generate_file_list(self, files_supported: set, files_unsupported: set, files_misc: set) -> Generator:
-        for supported_file in files_supported:
+        for supported_file in sorted(files_supported):
             arcname: str = os.path.relpath(supported_file, self.settings.project_data_path)
             target_file: str = os.path.join(self.settings.build_data_path, arcname)
             yield target_file, arcname
 
-        for unsupported_file in files_unsupported.union(files_misc):
+        for unsupported_file in sorted(files_unsupported.union(files_misc)):
             if unsupported_file.endswith('.tbl'):
                 continue
             target_arcname = os.path.relpath(unsupported_file, self.settings.project_data_path)
             yield unsupported_file, target_arcname
 
-    def generate_pak(self) -> None:
-        project_files = [f for f in glob.iglob(self.project_glob_all, recursive=True)
-                         if os.path.isfile(f) and not f.endswith('.pak') and not f.endswith('.tbl')]
+    @staticmethod
+    def _make_zip_info(arcname: str, compress_type: int = ZIP_STORED) -> ZipInfo:
+        zinfo = ZipInfo(arcname, date_time=Packager.ZIP_DATE_TIME)
+        zinfo.create_system = 3
+        zinfo.external_attr = Packager.ZIP_EXTERNAL_ATTR
+        zinfo.compress_type = compress_type
+        return zinfo
+
+    @staticmethod
+    def _write_file(zip_file: ZipFileFixed, filename: str, zinfo: ZipInfo) -> None:
+        """Copies a file into a ZIP under a prepared ZipInfo, unlike ZipFile.write which takes the file's timestamp"""
+        force_zip64: bool = os.path.getsize(filename) * 1.05 > ZIP64_LIMIT
+
+        with open(filename, 'rb') as source, zip_file.open(zinfo, 'w', force_zip64=force_zip64) as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+
+    @staticmethod
+    def _crc32_file(filename: str) -> int:
+        crc: int = 0
+
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                crc = zlib.crc32(chunk, crc)
+
+        return crc
+
+    def _get_file_crc(self, filename: str) -> int:
+        """Returns the CRC32 of a file, which is read again only if it changed since the build manifest recorded it"""
+        if self.build_manifest is None:
+            return self._crc32_file(filename)
+
+        stamp: list = BuildManifest.make_stamp(filename)
+        crc: int = self.build_manifest.get_file_crc(filename, stamp)
+
+        if crc is None:
+            crc = self._crc32_file(filename)
+            self.build_manifest.update_file_crc(filename, stamp, crc)
+
+        return crc
+
+    def _is_unchanged(self, previous_zinfo: ZipInfo, filename: str, data: object) -> bool:
+        """Returns whether a PAK member would have the same size and CRC as in the previous PAK"""
+        # streamed members are only known once written, see _write_pak
+        if previous_zinfo is None or callable(data):
+            return False
+
+        if data is not None:
+            return len(data) == previous_zinfo.file_size and zlib.crc32(data) == previous_zinfo.CRC
+
+        # modified times alone are not trusted, as copying, restoring or checking out files can make them older than the PAK
+        if os.path.getsize(filename) != previous_zinfo.file_size:
+            return False
+
+        return self._get_file_crc(filename) == previous_zinfo.CRC
+
+    @staticmethod
+    def _can_keep_previous_pak(previous_pak: ZipFileFixed, previous_zinfos: dict, arcnames: list, unchanged: list) -> bool:
+        """Returns whether every member is unchanged and in the same order as in the previous PAK, so it can be kept"""
+        if not previous_pak or not all(unchanged) or arcnames != list(previous_zinfos):
+            return False
+
+        Log.info('Unchanged since last build. Keeping previous PAK.', prefix='\t')
+        return True
+
+    @staticmethod
+    def _open_previous_pak(pak_path: str) -> ZipFileFixed:
+        try:
+            return ZipFileFixed(pak_path, 'r')
+        except (OSError, BadZipFile):
+            return None
 
-        # we only care about xml files for patching and tbl generation
-        project_files_xml = [f for f in project_files if f.endswith('.xml')]
+    def _write_pak(self, pak_path: str, members: list) -> None:
+        """
+        Writes a PAK from (file name, arcname, data) members, where data is None for members read from file name,
+        or a callable that streams the member into a writable file object.
+        Members unchanged since the previous PAK are copied from it, and the previous PAK is kept if nothing changed.
+        """
+        os.makedirs(os.path.dirname(pak_path), exist_ok=True)
 
-        # separate supported and unsupported files
-        project_files_xml_supported = set(f for f in project_files_xml
-                                          if not any(x.lower() in f.lower() for x in self.settings.exclusions))
+        previous_pak: ZipFileFixed = self._open_previous_pak(pak_path)
+        previous_zinfos: dict = {zinfo.filename: zinfo for zinfo in previous_pak.infolist()} if previous_pak else {}
 
-        project_files_xml_unsupported = set(project_files_xml) - set(project_files_xml_supported)
+        arcnames: list = [fix_slashes(arcname) for _, arcname, _ in members]
+
+        unchanged: list = [self._is_unchanged(previous_zinfos.get(arcname), filename, data)
+                           for (filename, _, data), arcname in zip(members, arcnames)]
+
+        # CRCs read from files are recorded, so files that are not changed again are not read by the next build
+        if self.build_manifest:
+            self.build_manifest.save()
+
+        try:
+            if self._can_keep_previous_pak(previous_pak, previous_zinfos, arcnames, unchanged):
+                return
+
+            # the previous pak is read while the new pak is written, so the new pak is moved into place after
+            with ZipFileFixed(pak_path + '.tmp', 'w', ZIP_STORED) as zip_file:
+                for (filename, _, data), arcname, is_unchanged in zip(members, arcnames, unchanged):
+                    zinfo: ZipInfo = self._make_zip_info(arcname)
+
+                    with Profiler.measure('zip_write', arcname):
+                        if is_unchanged:
+                            previous_zinfo: ZipInfo = previous_zinfos[arcname]
+
+                            zinfo.compress_type = previous_zinfo.compress_type
+                            zinfo.CRC = previous_zinfo.CRC
+                            zinfo.file_size = previous_zinfo.file_size
+                            zinfo.compress_size = previous_zinfo.compress_size
+
+                            with previous_pak.open_raw(previous_zinfo) as source:
+                                zip_file.write_raw(zinfo, source)
+                        elif data is None:
+                            self._write_file(zip_file, filename, zinfo)
+                        elif callable(data):
+                            with zip_file.open(zinfo, 'w') as target:
+                                data(target)
+
+                            # the size and CRC of a streamed member are set when its handle is closed
+                            previous_zinfo: ZipInfo = previous_zinfos.get(arcname)
+                            unchanged[arcnames.index(arcname)] = previous_zinfo is not None \
+                                and (zinfo.file_size, zinfo.CRC) == (previous_zinfo.file_size, previous_zinfo.CRC)
+                        else:
+                            zip_file.writestr(zinfo, data)
+
+                    # patched files written from memory have no file in the build folder, so the member is logged
+                    Log.info(f'File added to PAK: "{arcname}"')
+
+                    if data is None:
+                        Log.debug(f'Source: "{self.settings.make_project_relative(filename)}"', prefix='\t')
+
+                    if is_unchanged:
+                        Log.debug('Unchanged since last build. Copied from previous PAK.', prefix='\t')
+        finally:
+            if previous_pak:
+                previous_pak.close()
+
+        if self._can_keep_previous_pak(previous_pak, previous_zinfos, arcnames, unchanged):
+            os.remove(pak_path + '.tmp')
+            return
+
+        os.replace(pak_path + '.tmp', pak_path)
+
+    def generate_pak(self) -> None:
+        # we only care about xml files for patching and tbl generation, and exclusions are not patched
+        project_files_xml_supported = set(self.inventory.get_paths(ProjectInventory.DATA_XML))
+        project_files_xml_unsupported = set(self.inventory.get_paths(ProjectInventory.DATA_XML_EXCLUDED))
 
         # separate non-xml files from xml files
-        project_files_other = set(project_files) - set(project_files_xml)
+        project_files_other = set(self.inventory.get_paths(ProjectInventory.DATA_ASSET))
 
         Log.info('Patching game data...',
                  prefix=os.linesep,
                  suffix=os.linesep + self.sep)
 
-        patcher: Patcher = Patcher(self.settings)
-        patcher.patch_data(list(project_files_xml_supported))
+        # files are patched, and logged, in the same order on every run
+        patcher: Patcher = Patcher(self.settings, self.game_cache, self.build_manifest)
+        patcher.patch_data(sorted(project_files_xml_supported))
 
         Log.info('Writing PAK: "%s"' % self.settings.make_project_relative(self.settings.build_package_path),
                  prefix=os.linesep,
                  suffix=os.linesep + self.sep)
 
-        target_folder = os.path.dirname(self.settings.build_package_path)
-        os.makedirs(target_folder, exist_ok=True)
+        members: list = []
 
-        with ZipFileFixed(self.settings.build_package_path, 'w', ZIP_STORED) as zip_file:
-            for filename, arcname in self._generate_file_list(project_files_xml_supported,
-                                                              project_files_xml_unsupported, project_files_other):
-                base_name = os.path.basename(arcname)
+        for filename, arcname in self._generate_file_list(project_files_xml_supported,
+                                                          project_files_xml_unsupported, project_files_other):
+            base_name = os.path.basename(arcname)
 
-                if '__' not in base_name and filename.lower().endswith('.xml'):
-                    file_name, file_extension = os.path.splitext(base_name)
+            if '__' not in base_name and filename.lower().endswith('.xml'):
+                file_name, file_extension = os.path.splitext(base_name)
 
-                    arcname = '%s%s__%s%s' % (arcname[:-len(base_name)],
-                                              file_name,
-                                              self.settings.pak_file_name.lower().replace(' ', '_'),
-                                              file_extension)
+                arcname = '%s%s__%s%s' % (arcname[:-len(base_name)],
+                                          file_name,
+                                          self.settings.pak_file_name.lower().replace(' ', '_'),
+                                          file_extension)
 
-                zip_file.write(filename, arcname)
+            # patched files are written from memory, unless the build tree is kept
+            members.append((filename, arcname, patcher.outputs.get(filename)))
 
-                Log.info('File added to PAK: "%s"' % self.settings.make_project_relative(filename))
-                Log.debug(f'arcname="{arcname}"', prefix='\t')
+        self._write_pak(self.settings.build_package_path, members)
 
     def generate_i18n(self) -> None:
-        folder_names: list = os.listdir(self.settings.project_i18n_path)
+        folder_names: list = self.inventory.i18n_folders
         xml_files: list = self._prepare_i18n_targets(folder_names)
 
         try:
@@ -134,24 +301,48 @@ class Packager:
                  prefix=os.linesep,
                  suffix=os.linesep + self.sep)
 
-        patcher: Patcher = Patcher(self.settings)
-        patcher.patch_localization(xml_files)
+        patcher: Patcher = Patcher(self.settings, self.game_cache, self.build_manifest)
+        patcher.patch_localization(sorted(xml_files))
+
+        keep_build_tree: bool = self.settings.options.keep_build_tree
+        merged_file_name = f'text__{self.settings.pak_file_name.lower().replace(" ", "_")}.xml'
 
         for folder_name in folder_names:
             build_lang_path = os.path.join(self.settings.build_localization_path, folder_name)
-            glob_build_lang_xml = os.path.join(build_lang_path, '*.xml')
+            folder_xml_files: list = [f for f in xml_files if os.path.basename(os.path.dirname(f)) == folder_name]
 
-            if not os.path.exists(build_lang_path):
-                Log.warn(f'Cannot build PAK. Folder missing: "{build_lang_path}"',
-                         prefix=os.linesep)
-                continue
+            if keep_build_tree:
+                if not os.path.exists(build_lang_path):
+                    Log.warn(f'Cannot build PAK. Folder missing: "{build_lang_path}"',
+                             prefix=os.linesep)
+                    continue
 
-            lang_files = os.listdir(build_lang_path)
-            lang_files_xml = fnmatch.filter(lang_files, '*.xml')
-            if len(lang_files_xml) == 0:
-                Log.warn(f'Cannot build PAK. Folder empty or does not contain XML files: "{build_lang_path}"',
-                         prefix=os.linesep)
-                continue
+                lang_files = os.listdir(build_lang_path)
+                lang_files_xml = fnmatch.filter(lang_files, '*.xml')
+                if len(lang_files_xml) == 0:
+                    Log.warn(f'Cannot build PAK. Folder empty or does not contain XML files: "{build_lang_path}"',
+                             prefix=os.linesep)
+                    continue
+
+                if self.settings.options.pack_assets:
+                    self._copy_assets_to_build_path(folder_xml_files, build_lang_path, self.settings.localization)
+
+                # skip merged file left by an incremental build
+                source_files: list = [f for f in glob.iglob(os.path.join(build_lang_path, '*.xml'), recursive=False)
+                                      if os.path.basename(f) != merged_file_name]
+            else:
+                source_files = [f for f in patcher.outputs if os.path.dirname(f) == build_lang_path]
+
+                if self.settings.options.pack_assets:
+                    source_files.extend(f for f in folder_xml_files if os.path.basename(f) not in self.settings.localization)
+
+                if len(source_files) == 0:
+                    Log.warn(f'Cannot build PAK. No patched XML files for folder: "{folder_name}"',
+                             prefix=os.linesep)
+                    continue
+
+            # rows are merged in file name order, so merged files do not depend on the file system or on the build tree
+            source_files.sort(key=os.path.basename)
 
             lang_pak_file_name = build_lang_path + self.settings.pak_extension
 
@@ -159,35 +350,85 @@ class Packager:
                      prefix=os.linesep,
                      suffix=os.linesep + self.sep)
 
-            if self.settings.options.pack_assets:
-                self._copy_assets_to_build_path(xml_files, build_lang_path, self.settings.localization)
+            merged_file_path: str = os.path.join(build_lang_path, merged_file_name)
+            write_merged: Callable = self._make_i18n_merger(source_files, patcher.outputs)
 
-            target_folder = os.path.dirname(lang_pak_file_name)
-            os.makedirs(target_folder, exist_ok=True)
+            # rows are streamed into the merged file, which is written straight into the PAK unless the build tree is kept
+            if keep_build_tree:
+                with open(merged_file_path, 'wb') as f:
+                    write_merged(f)
 
-            with ZipFileFixed(lang_pak_file_name, 'w', ZIP_STORED) as zip_file:
-                rows = []
+                self._write_pak(lang_pak_file_name, [(merged_file_path, merged_file_name, None)])
+            else:
+                self._write_pak(lang_pak_file_name, [(merged_file_path, merged_file_name, write_merged)])
 
-                for filename in glob.iglob(glob_build_lang_xml, recursive=False):
-                    xml_tree = etree.parse(filename, XML_PARSER)
-                    xml_rows = PRECOMPILED_XPATH_ROW(xml_tree)
-                    rows.extend(xml_rows)
+    @staticmethod
+    def _make_i18n_merger(source_files: list, outputs: dict) -> Callable:
+        """
+        Returns a callable that writes the rows of every source file into one localization table, one row at a time
+        :param source_files: Paths to localization XML files, in merge order
+        :param outputs: Patched XML data keyed by output path, for files that were not written to disk
+        """
+        def iter_rows() -> Generator:
+            for filename in source_files:
+                output_data: bytes = outputs.get(filename)
+                yield from Patcher.iter_elements(filename if output_data is None else io.BytesIO(output_data),
+                                                 Packager.I18N_ROW_TAGS)
+
+        def write_merged(target: IO) -> None:
+            rows: Generator = iter_rows()
+            first_row: etree._Element = next(rows, None)
+
+            # laid out like a pretty-printed table, so the output matches merging every row in memory
+            with etree.xmlfile(target, encoding='utf-8') as xf:
+                if first_row is None:
+                    xf.write(etree.Element('Table'))
+                else:
+                    with xf.element('Table'):
+                        for row in itertools.chain((first_row,), rows):
+                            etree.indent(row, level=1)
+                            xf.write('\n  ', row)
 
-                merged_file_name = f'text__{self.settings.pak_file_name.lower().replace(" ", "_")}.xml'
+                        xf.write('\n')
 
-                table = etree.Element('Table')
-                table.extend(rows)
+            target.write(b'\n')
 
-                root = etree.ElementTree(table, parser=XML_PARSER)
-                root.write(os.path.join(build_lang_path, merged_file_name), encoding='utf-8', pretty_print=True, xml_declaration=False)
+        return write_merged
 
-                arcname: str = os.path.relpath(os.path.join(build_lang_path, merged_file_name), build_lang_path)
+    @staticmethod
+    def _compress_member(filename: str, arcname: str, compression_level: int) -> tuple:
+        """Deflates a file for the ZIP. Returns (ZipInfo, compressed data), or (ZipInfo, None) when the file is stored."""
+        zinfo = Packager._make_zip_info(arcname, ZIP_DEFLATED)
 
-                zip_file.write(filename, arcname)
+        compressor = zlib.compressobj(compression_level, zlib.DEFLATED, -15) if compression_level else None
 
-                Log.info(f'File added to PAK: "{self.settings.make_project_relative(filename)}"')
-                Log.debug(f'arcname="{arcname}"',
-                          prefix='\t')
+        # compressed data spills to disk, so large PAKs do not need to fit in memory
+        compressed_data = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+        crc: int = 0
+
+        with Profiler.measure('zip_compress', arcname), open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                crc = zlib.crc32(chunk, crc)
+                zinfo.file_size += len(chunk)
+
+                if compressor:
+                    compressed_data.write(compressor.compress(chunk))
+
+            if compressor:
+                compressed_data.write(compressor.flush())
+
+        zinfo.CRC = crc
+        zinfo.compress_size = compressed_data.tell()
+
+        # store members that deflate does not shrink, like PAKs of already compressed textures
+        if compressor is None or zinfo.compress_size >= zinfo.file_size:
+            compressed_data.close()
+            zinfo.compress_type = ZIP_STORED
+            zinfo.compress_size = zinfo.file_size
+            return zinfo, None
+
+        compressed_data.seek(0)
+        return zinfo, compressed_data
 
     def pack(self) -> str:
         """Writes build assets to ZIP file. Returns output ZIP file path."""
@@ -199,28 +440,41 @@ class Packager:
         target_folder = os.path.dirname(self.settings.build_zip_file_path)
         os.makedirs(target_folder, exist_ok=True)
 
-        with ZipFileFixed(self.settings.build_zip_file_path, 'w', ZIP_DEFLATED) as zip_file:
-            zip_file.write(self.settings.project_manifest_path, self.settings.zip_manifest_arc_name, ZIP_DEFLATED)
+        members: list = [(self.settings.project_manifest_path, self.settings.zip_manifest_arc_name)]
 
-            Log.info(f'File added to ZIP: "{self.settings.make_project_relative(self.settings.project_manifest_path)}"')
-            Log.debug(f'arcname="{self.settings.zip_manifest_arc_name}"',
-                      prefix='\t')
+        build_pak_files: list = [entry.path for entry in ProjectInventory.walk(self.settings.build_zip_folder_path)
+                                 if entry.name.endswith('.pak')]
 
-            build_pak_files: list = glob.glob(self.build_glob_paks, recursive=True)
+        project_pak_files: list = self.inventory.get_paths(ProjectInventory.PAK)
 
-            project_pak_files: list = [f for f in glob.iglob(self.project_glob_paks, recursive=True)
-                                       if self.settings.project_build_path not in os.path.dirname(f)]
+        for filename in build_pak_files + project_pak_files:
+            if filename in project_pak_files:
+                arcname = os.path.join(self.settings.pak_file_name, self.settings.make_project_relative(filename))
+            else:
+                arcname = os.path.relpath(filename, self.settings.project_build_path)
 
-            for filename in build_pak_files + project_pak_files:
-                if filename in project_pak_files:
-                    arcname = os.path.join(self.settings.pak_file_name, self.settings.make_project_relative(filename))
-                else:
-                    arcname = os.path.relpath(filename, self.settings.project_build_path)
+            members.append((filename, arcname))
+
+        # members are written in a fixed order, so unchanged builds produce identical archives
+        members.sort(key=lambda member: fix_slashes(member[1]))
+
+        compression_level: int = self.settings.options.compression_level
+
+        # members are compressed concurrently, because zlib releases the GIL
+        with ThreadPoolExecutor(max_workers=min(len(members), os.cpu_count() or 1)) as executor, \
+                ZipFileFixed(self.settings.build_zip_file_path, 'w', ZIP_DEFLATED) as zip_file:
+            futures: list = [executor.submit(self._compress_member, filename, arcname, compression_level)
+                             for filename, arcname in members]
+
+            for (filename, arcname), future in zip(members, futures):
+                zinfo, compressed_data = future.result()
 
-                zip_file.write(filename, arcname)
+                with Profiler.measure('zip_write', arcname):
+                    with compressed_data or open(filename, 'rb') as f:
+                        zip_file.write_raw(zinfo, f)
 
                 Log.info(f'File added to ZIP: "{self.settings.make_project_relative(filename)}"')
-                Log.debug(f'arcname="{arcname}"',
+                Log.debug(f'arcname="{zinfo.filename}"',
                           prefix='\t')
 
         return self.settings.build_zip_file_path
@@ -1,63 +1,211 @@
 import copy
 import os
-from decimal import Decimal
+import queue
+import threading
+from collections import deque
+from concurrent.futures import (ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from decimal import (Decimal,
+                     InvalidOperation)
+from itertools import (islice,
+                       repeat)
+from typing import (Callable,
+                    Generator,
+                    IO,
+                    Iterable,
+                    Iterator)
 
 from lxml import etree
 
 from modsmith import (PRECOMPILED_XPATH_ROW,
+                      SHARED_PARSER_OPTIONS,
+                      BuildManifest,
+                      GameCache,
+                      GamePak,
+                      Profiler,
                       ProjectSettings,
                       SimpleLogger as Log,
                       XML_PARSER,
                       XML_PARSER_ALLOW_COMMENTS,
-                      ZipFileFixed,
                       fix_slashes)
 
 
 class Patcher:
-    def __init__(self, settings: ProjectSettings) -> None:
+    # bump when the diff rules change, so incremental builds do not reuse outputs produced under the old rules
+    DIFF_VERSION: int = 2
+
+    # number of upcoming files whose vanilla indexes are loaded while the current file is diffed
+    PREFETCH_DEPTH: int = 2
+
+    # number of patched files that may wait to be stored before diffing waits for the writer
+    OUTPUT_QUEUE_SIZE: int = 4
+
+    def __init__(self, settings: ProjectSettings, game_cache: GameCache = None, build_manifest: BuildManifest = None) -> None:
         self.settings = settings
         self.sanitized_mod_name = self.settings.pak_file_name.lower().replace(' ', '_')
 
+        # vanilla indexes are keyed by game pak member and shared across project files
+        self.game_cache: GameCache = game_cache or GameCache(self.settings.cache_path)
+
+        # unchanged files reuse their previous output when building incrementally
+        self.build_manifest: BuildManifest = build_manifest
+
+        # patched files are serialized here, keyed by output path, unless the build tree is kept
+        self.outputs: dict = {}
+
+        self.game_paks: dict = {}
+        self._game_paks_lock = threading.Lock()
+
+        # fingerprints taken when vanilla indexes are prefetched or published, so project files are hashed once
+        self._fingerprints: dict = {}
+
     def _get_game_pak_by_absolute_xml_path(self, xml_path: str) -> str:
         if os.path.isabs(xml_path):
             xml_path = os.path.relpath(xml_path, self.settings.project_path)
 
         xml_path = fix_slashes(xml_path)
 
-        for path in self.settings.packages:
-            if xml_path.startswith(path):
-                return self.settings.packages[path]
+        pak_file_name: str = self.settings.config.find_package(xml_path)
+
+        if pak_file_name is None:
+            raise FileNotFoundError(f'Cannot find PAK file by path: {xml_path}')
 
-        raise FileNotFoundError(f'Cannot find PAK file by path: {xml_path}')
+        return pak_file_name
 
     def _get_signature_by_path(self, path: str) -> tuple:
         path = fix_slashes(path)
 
-        for i, key in enumerate(self.settings.signatures):
-            signature_key: str = next(iter(key))
+        signature: tuple = self.settings.config.find_signature(path)
 
-            if not path.endswith(signature_key):
-                continue
+        if signature is None:
+            raise NotImplementedError(f'Cannot find signature by path: {path}')
+
+        return signature
 
-            signature: dict = self.settings.signatures[i][signature_key][0]
-            return signature['element'], signature['attributes']
+    @staticmethod
+    def normalize_number(value: str) -> object:
+        """Returns a number so that e.g. 1, 1.0 and 1.00 compare equal, or value when it is not a number"""
+        try:
+            number: Decimal = Decimal(value)
+        except InvalidOperation:
+            return value
 
-        raise NotImplementedError(f'Cannot find signature by path: {path}')
+        # NaN never compares equal, so it is compared as text
+        return value if number.is_nan() else number
 
     @staticmethod
-    def find_row_differences(project_row: etree.Element, game_row: etree.Element) -> set:
-        results = set()
+    def get_normalizer(column_type: str) -> Callable[[str], object]:
+        """Returns a function that maps values of a header column type to comparable values, or None to compare text"""
+        if column_type in ('integer', 'real'):
+            return Patcher.normalize_number
+        if column_type in ('boolean', 'uuid'):
+            return str.casefold
+        return None
 
-        for project_key, project_value in project_row.attrib.items():
-            if project_key not in game_row.attrib:
-                results.add(project_key)
+    @staticmethod
+    def find_changed_attributes(project_rows: list, game_rows: list, column_types: dict) -> list:
+        """
+        Returns a set for each project row of attribute names that are missing from, or differ from, its matching game row
+        :param project_rows: Project row elements
+        :param game_rows: Attributes of the matching game rows, in the same order, or None for rows new to the game
+        :param column_types: Header column types keyed by lowercase column name
+        """
+        changed: list = [set() for _ in project_rows]
+
+        project_attributes: list = [dict(project_row.attrib) for project_row in project_rows]
+        column_names: set = set().union(*project_attributes)
+
+        # rows are compared one column at a time, so each column resolves its normalizer once
+        for column_name in column_names:
+            normalize = Patcher.get_normalizer(column_types.get(column_name.lower()))
+
+            project_column: list = [attributes.get(column_name) for attributes in project_attributes]
+            game_column: list = [attributes.get(column_name) if attributes is not None else None for attributes in game_rows]
+
+            for i, (project_value, game_value) in enumerate(zip(project_column, game_column)):
+                if project_value is None or project_value == game_value:
+                    continue
+
+                if game_value is None or normalize is None or normalize(project_value) != normalize(game_value):
+                    changed[i].add(column_name)
+
+        return changed
+
+    @staticmethod
+    def find_changed_rows(project_rows: list, game_rows: list, column_types: dict) -> bytearray:
+        """Returns a mask of project rows with attributes that are missing from, or differ from, their matching game rows"""
+        return bytearray(1 if attributes else 0 for attributes in Patcher.find_changed_attributes(project_rows, game_rows, column_types))
+
+    @staticmethod
+    def get_column_types(project_xml_tree: etree.ElementTree) -> dict:
+        """Returns header column types keyed by lowercase column name"""
+        project_xpath = etree.XPathEvaluator(project_xml_tree)
+        return {(column.get('name') or '').lower(): (column.get('type') or '').lower()
+                for column in project_xpath('//column')}
+
+    @staticmethod
+    def iter_elements(game_xml: IO, tag: object) -> Generator:
+        """Yields matching elements while streaming game_xml, discarding each element after it has been consumed"""
+        for _, element in etree.iterparse(game_xml, events=('end',), tag=tag, remove_comments=True, **SHARED_PARSER_OPTIONS):
+            yield element
+
+            # drop the element and already consumed siblings so memory does not scale with the table
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+    @staticmethod
+    def iter_rows(game_xml: IO, element_name: str, element_attributes: list, keys: set = None) -> Generator:
+        """
+        Yields (signature key, row attributes) pairs while streaming a game table, e.g. to be packed by GameCache
+        :param game_xml: Stream of game table
+        :param element_name: Name of row elements
+        :param element_attributes: Names of signature attributes
+        :param keys: Signature keys to keep, or None to keep all rows
+        """
+        for row in Patcher.iter_elements(game_xml, element_name):
+            key = tuple(row.get(attribute) for attribute in element_attributes)
+
+            # rows without every signature attribute cannot be matched
+            if None in key:
                 continue
 
-            if project_value != game_row.get(project_key):
-                results.add(project_key)
+            if keys is not None and key not in keys:
                 continue
 
-        return results
+            yield key, dict(row.attrib)
+
+    @staticmethod
+    def index_rows(game_xml: IO, element_name: str, element_attributes: list, keys: set) -> tuple:
+        """
+        Returns a dict of row attributes keyed by signature attribute values, and a set of keys shared by multiple rows
+        :param game_xml: Stream of game table
+        :param element_name: Name of row elements
+        :param element_attributes: Names of signature attributes
+        :param keys: Signature keys to keep
+        """
+        rows = {}
+        duplicate_keys = set()
+
+        for key, attributes in Patcher.iter_rows(game_xml, element_name, element_attributes, keys):
+            if key in rows:
+                duplicate_keys.add(key)
+                continue
+
+            rows[key] = attributes
+
+        return rows, duplicate_keys
+
+    @staticmethod
+    def iter_localization(game_xml: IO) -> Generator:
+        """Yields (string key, (source, translation)) pairs while streaming a game localization table"""
+        for row in Patcher.iter_elements(game_xml, ('Row', 'row')):
+            if len(row) < 3:
+                continue
+
+            key, source, translation = (c.text for c in list(row)[:3])
+
+            yield key, (source, translation)
 
     @staticmethod
     def find_root(element: etree.Element, tag: str) -> etree.Element:
@@ -65,126 +213,295 @@ class Patcher:
             element = element.getparent()
         return element.getparent()
 
-    def patch_data(self, xml_file_list: list) -> None:
-        game_paks = {}
+    def _get_game_pak(self, game_pak_path: str) -> GamePak:
+        # we don't want to open the same game pak more than once, including from the prefetch thread
+        with self._game_paks_lock:
+            if game_pak_path not in self.game_paks:
+                self.game_paks[game_pak_path] = GamePak(game_pak_path, self.settings.pak_index_path)
+            return self.game_paks[game_pak_path]
 
-        for xml_file in xml_file_list:
-            project_xml_path_relative = os.path.relpath(xml_file, self.settings.project_data_path)
-            project_xml_path_absolute = os.path.join(self.settings.project_data_path, project_xml_path_relative)
+    def close(self) -> None:
+        """Closes game paks open in memory"""
+        with self._game_paks_lock:
+            for game_pak in self.game_paks.values():
+                game_pak.close()
+            self.game_paks.clear()
+
+    @staticmethod
+    def _serialize_output(output_tree: etree.ElementTree, xml_declaration: bool = False) -> bytes:
+        return etree.tostring(output_tree, encoding='UTF-8', pretty_print=True, xml_declaration=xml_declaration)
+
+    def _store_output(self, output_path: str, output_data: bytes) -> None:
+        """Writes a patched file to output_path, if the build tree is kept, or else keeps it in outputs"""
+        if not self.settings.options.keep_build_tree:
+            self.outputs[output_path] = output_data
+            return
+
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+        with open(output_path, 'wb') as f:
+            f.write(output_data)
+
+    def _load_game_rows(self, game_pak: GamePak, game_pak_path: str, game_pak_arcname: str, element_name: str,
+                        element_attributes: list, project_rows: list) -> tuple:
+        """Returns a mapping of game row attributes keyed by signature key, and a set of keys shared by multiple rows"""
+        signature = (element_name, tuple(element_attributes))
+
+        # full indexes are packed, so they hold every row without costing a dict per row
+        if self._is_indexed_fully():
+            return self.game_cache.load(game_pak, game_pak_path, game_pak_arcname, signature,
+                                        lambda f: self.iter_rows(f, element_name, element_attributes))
+
+        # without a persistent or shared cache, only keep the game rows this project file can match
+        project_keys = {tuple(project_row.get(key) for key in element_attributes) for project_row in project_rows}
+
+        with game_pak.open_mapped(game_pak_arcname) as game_xml:
+            return self.index_rows(game_xml, element_name, element_attributes, project_keys)
+
+    def get_game_crc(self, xml_file: str) -> int:
+        """Returns the CRC32 of the game pak member patched by a project data file"""
+        game_pak_arcname = fix_slashes(os.path.relpath(xml_file, self.settings.project_data_path))
+        game_pak_path = os.path.join(self.settings.game_path, 'Data', self._get_game_pak_by_absolute_xml_path(xml_file))
+
+        return self._get_game_pak(game_pak_path).getinfo(game_pak_arcname).CRC
+
+    def find_patched_attributes(self, xml_file: str) -> tuple:
+        """
+        Returns the game pak member patched by a project data file, and the names of attributes it patches keyed by
+        signature key. Rows identical to the game are left out, as when patching, and new rows patch every attribute.
+        """
+        project_xml_path_relative = os.path.relpath(xml_file, self.settings.project_data_path)
+        game_pak_arcname = fix_slashes(project_xml_path_relative)
+
+        element_name, element_attributes = self._get_signature_by_path(xml_file)
+        element_attributes = sorted(element_attributes)
+
+        game_pak_path = os.path.join(self.settings.game_path, 'Data', self._get_game_pak_by_absolute_xml_path(xml_file))
+        game_pak = self._get_game_pak(game_pak_path)
+
+        project_xml_tree = etree.parse(xml_file, XML_PARSER)
+        project_rows: list = PRECOMPILED_XPATH_ROW(project_xml_tree)
+
+        game_rows, duplicate_keys = self._load_game_rows(game_pak, game_pak_path, game_pak_arcname,
+                                                         element_name, element_attributes, project_rows)
+
+        project_keys: list = [tuple(project_row.get(key) for key in element_attributes) for project_row in project_rows]
+
+        changed_attributes: list = self.find_changed_attributes(project_rows, [game_rows.get(key) for key in project_keys],
+                                                                self.get_column_types(project_xml_tree))
+
+        patched_attributes: dict = {}
+
+        for project_key, attributes in zip(project_keys, changed_attributes):
+            # rows without every signature attribute cannot be matched
+            if None in project_key or not attributes:
+                continue
+
+            if project_key in duplicate_keys:
+                raise Exception('Too many matching rows')
+
+            patched_attributes.setdefault(project_key, set()).update(attributes)
+
+        return game_pak_arcname, patched_attributes
+
+    def _get_fingerprint(self, xml_file: str, game_crc: int, signature: tuple) -> dict:
+        """Returns the build manifest fingerprint of a project file, reusing one already taken for the same inputs"""
+        inputs: tuple = (game_crc, signature)
+        cached: tuple = self._fingerprints.get(xml_file)
+
+        if cached is not None and cached[0] == inputs:
+            return cached[1]
+
+        fingerprint: dict = self.build_manifest.make_fingerprint(xml_file, game_crc, signature, self.DIFF_VERSION)
+        self._fingerprints[xml_file] = (inputs, fingerprint)
+        return fingerprint
+
+    def _is_indexed_fully(self) -> bool:
+        """Returns whether vanilla indexes hold every row, so they can be reused by other project files"""
+        return bool(self.game_cache.cache_path or self.game_cache.shared or self.game_cache.published)
+
+    def _get_data_index(self, xml_file: str) -> tuple:
+        """Returns GameCache.load arguments for the vanilla index of a project data file, or None if it is not needed"""
+        # without a persistent, shared or published cache, indexes only keep the rows of one project file
+        if not self._is_indexed_fully():
+            return None
+
+        project_xml_path_relative = os.path.relpath(xml_file, self.settings.project_data_path)
+        game_pak_arcname = fix_slashes(project_xml_path_relative)
+
+        element_name, element_attributes = self._get_signature_by_path(xml_file)
+        element_attributes = sorted(element_attributes)
+
+        game_pak_path = os.path.join(self.settings.game_path, 'Data', self._get_game_pak_by_absolute_xml_path(xml_file))
+        game_pak = self._get_game_pak(game_pak_path)
+
+        if self.build_manifest:
+            manifest_key = fix_slashes(self.settings.make_project_relative(xml_file))
+            fingerprint = self._get_fingerprint(xml_file, game_pak.getinfo(game_pak_arcname).CRC,
+                                                (element_name, tuple(element_attributes)))
 
-            element_name, element_attributes = self._get_signature_by_path(project_xml_path_absolute)
+            if self.build_manifest.is_current(manifest_key, fingerprint,
+                                              os.path.join(self.settings.build_data_path, project_xml_path_relative)):
+                return None
 
-            Log.info(f'Patching XML file: "{project_xml_path_relative}"')
-            Log.debug(f'Source: "{project_xml_path_absolute}"',
-                      prefix='\t')
+        return (game_pak, game_pak_path, game_pak_arcname, (element_name, tuple(element_attributes)),
+                lambda f: self.iter_rows(f, element_name, element_attributes))
 
-            game_pak_filename = self._get_game_pak_by_absolute_xml_path(project_xml_path_absolute)
+    def _patch_data_file(self, xml_file: str) -> tuple:
+        """Patches one project data file. Returns a (manifest key, fingerprint, output path, output data) tuple, or None."""
+        project_xml_path_relative = os.path.relpath(xml_file, self.settings.project_data_path)
+        project_xml_path_absolute = os.path.join(self.settings.project_data_path, project_xml_path_relative)
+        build_xml_file_path = os.path.join(self.settings.build_data_path, project_xml_path_relative)
 
-            game_pak_arcname = project_xml_path_relative.replace(os.path.sep, os.path.altsep)
+        element_name, element_attributes = self._get_signature_by_path(project_xml_path_absolute)
 
-            # we don't want to open the same game pak more than once
-            if game_pak_filename not in game_paks:
-                # open game pak and store object in memory
-                game_pak_path = os.path.join(self.settings.game_path, 'Data', game_pak_filename)
-                game_paks.update({
-                    game_pak_filename: ZipFileFixed(game_pak_path, 'r')
-                })
+        Log.info(f'Patching XML file: "{project_xml_path_relative}"')
+        Log.debug(f'Source: "{project_xml_path_absolute}"',
+                  prefix='\t')
 
-            with game_paks[game_pak_filename].open(game_pak_arcname, 'r') as game_xml:
-                game_xml_tree = etree.parse(game_xml, XML_PARSER)
-                game_xpath = etree.XPathEvaluator(game_xml_tree)
+        game_pak_filename = self._get_game_pak_by_absolute_xml_path(project_xml_path_absolute)
 
+        game_pak_arcname = fix_slashes(project_xml_path_relative)
+
+        game_pak_path = os.path.join(self.settings.game_path, 'Data', game_pak_filename)
+        game_pak = self._get_game_pak(game_pak_path)
+
+        element_attributes = sorted(element_attributes)
+        signature = (element_name, tuple(element_attributes))
+
+        manifest_key, fingerprint = None, None
+
+        if self.build_manifest:
+            manifest_key = fix_slashes(self.settings.make_project_relative(project_xml_path_absolute))
+
+            fingerprint = self._get_fingerprint(xml_file, game_pak.getinfo(game_pak_arcname).CRC, signature)
+
+            if self.build_manifest.is_current(manifest_key, fingerprint, build_xml_file_path):
+                Log.info('Unchanged since last build. Reusing previous output.', prefix='\t')
+                return None
+
+        with Profiler.measure('parse_project', project_xml_path_relative):
             project_xml_tree = etree.parse(project_xml_path_absolute, XML_PARSER)
 
             project_rows: list = PRECOMPILED_XPATH_ROW(project_xml_tree)
 
-            if len(project_rows) == 0:
-                Log.warn(f'No rows found. Skipping: "{project_xml_path_absolute}"')
-                continue
+        if len(project_rows) == 0:
+            Log.warn(f'No rows found. Skipping: "{project_xml_path_absolute}"')
+            return None
 
-            project_xpath = etree.XPathEvaluator(project_xml_tree)
-            column_data = {column.get('name').lower(): column.get('type').lower()
-                           for column in project_xpath('//column')}
+        with Profiler.measure('parse_vanilla', project_xml_path_relative):
+            game_rows, duplicate_keys = self._load_game_rows(game_pak, game_pak_path, game_pak_arcname,
+                                                             element_name, element_attributes, project_rows)
 
-            duplicate_rows = set()
+        with Profiler.measure('diff', project_xml_path_relative):
+            # values are compared by header column type, so e.g. 1.0 and 1, or TRUE and true, are not changes
+            column_data = self.get_column_types(project_xml_tree)
 
-            for project_row in project_rows:
-                project_row_parent = project_row.getparent()
-                project_row_index = project_row_parent.index(project_row)
+            matched_rows: list = []
+            matched_game_rows: list = []
 
-                element_attrs = ' and '.join([f'@{key}="{project_row.get(key)}"'
-                                              for key in sorted(element_attributes)])
+            for project_row in project_rows:
+                project_key = tuple(project_row.get(key) for key in element_attributes)
 
-                matching_rows: list = game_xpath(f'//{element_name}[{element_attrs}]')
+                # packed indexes decode a row on each lookup, so rows are looked up once
+                game_row: dict = game_rows.get(project_key)
 
-                if len(matching_rows) == 0:
+                if game_row is None:
                     continue
 
-                if len(matching_rows) > 1:
+                if project_key in duplicate_keys:
                     raise Exception('Too many matching rows')
 
-                different_keys = self.find_row_differences(project_row, matching_rows[0])
-                if not different_keys or len(different_keys) == 0:
-                    project_row_parent.remove(project_row)
-                    duplicate_rows.add(True)
+                matched_rows.append(project_row)
+                matched_game_rows.append(game_row)
+
+            changed_rows: bytearray = self.find_changed_rows(matched_rows, matched_game_rows, column_data)
 
-            if (count := len(duplicate_rows)) > 0:
-                Log.warn(f'Removed {count} duplicate rows.', prefix='\t')
+            duplicate_count: int = 0
 
-            build_xml_file_path = os.path.join(self.settings.build_data_path, project_xml_path_relative)
+            for project_row, changed in zip(matched_rows, changed_rows):
+                if not changed:
+                    project_row.getparent().remove(project_row)
+                    duplicate_count += 1
 
-            target_folder = os.path.dirname(build_xml_file_path)
-            os.makedirs(target_folder, exist_ok=True)
+        if duplicate_count > 0:
+            Log.warn(f'Removed {duplicate_count} duplicate rows.', prefix='\t')
 
+        with Profiler.measure('write_xml', project_xml_path_relative):
             output_tree: etree.ElementTree = etree.ElementTree(project_xml_tree.getroot(), parser=XML_PARSER_ALLOW_COMMENTS)
-            output_tree.write(build_xml_file_path, encoding='utf-8', pretty_print=True, xml_declaration=True)
+            output_data: bytes = self._serialize_output(output_tree, xml_declaration=True)
 
-        # close game paks open in memory
-        for pak_file_path in game_paks:
-            game_paks[pak_file_path].close()
+        return manifest_key, fingerprint, build_xml_file_path, output_data
 
-    def patch_localization(self, xml_file_list: list) -> None:
-        game_paks = {}
+    def _get_localization_index(self, xml_file: str) -> tuple:
+        """Returns GameCache.load arguments for the vanilla index of a project localization file, or None if it is not needed"""
+        source_i18n_path_relative = os.path.relpath(xml_file, self.settings.project_i18n_path)
+        parent_path, file_name = os.path.split(source_i18n_path_relative)
 
-        # filter out unsupported xml files - we can arbitrarily add these later but we can't patch them
-        xml_file_list = (f for f in xml_file_list if os.path.basename(f) in self.settings.localization)
+        game_pak_filename = os.path.join(self.settings.game_path, 'Localization', parent_path + '.pak')
 
-        for xml_file in xml_file_list:
-            source_i18n_path_relative = os.path.relpath(xml_file, self.settings.project_i18n_path)
-            target_i18n_path_absolute = os.path.join(self.settings.build_localization_path, source_i18n_path_relative)
+        if not os.path.exists(game_pak_filename):
+            return None
 
-            parent_path, file_name = os.path.split(source_i18n_path_relative)
-            project_xml_path = os.path.join(self.settings.project_i18n_path, source_i18n_path_relative)
+        game_pak = self._get_game_pak(game_pak_filename)
 
-            Log.info(f'Patching XML file: "{source_i18n_path_relative}"')
-            Log.debug(f'project_xml_path="{project_xml_path}"', prefix='\t')
+        if self.build_manifest:
+            manifest_key = fix_slashes(self.settings.make_project_relative(xml_file))
+            fingerprint = self._get_fingerprint(xml_file, game_pak.getinfo(file_name).CRC, ('Row',))
 
-            project_rows: list = PRECOMPILED_XPATH_ROW(etree.parse(project_xml_path, XML_PARSER))
+            if self.build_manifest.is_current(manifest_key, fingerprint,
+                                              os.path.join(self.settings.build_localization_path, source_i18n_path_relative)):
+                return None
 
-            if len(project_rows) == 0:
-                Log.warn(f'No rows found. Cannot patch: "{project_xml_path}"')
-                continue
+        return game_pak, game_pak_filename, file_name, ('Row',), self.iter_localization
 
-            project_table = project_rows[0].getparent()
+    def _patch_localization_file(self, xml_file: str) -> tuple:
+        """Patches one project localization file. Returns a (manifest key, fingerprint, output path, output data) tuple, or None."""
+        source_i18n_path_relative = os.path.relpath(xml_file, self.settings.project_i18n_path)
+        target_i18n_path_absolute = os.path.join(self.settings.build_localization_path, source_i18n_path_relative)
 
-            # read zipped pak xml
-            game_pak_filename = os.path.join(self.settings.game_path, 'Localization', parent_path + '.pak')
+        parent_path, file_name = os.path.split(source_i18n_path_relative)
+        project_xml_path = os.path.join(self.settings.project_i18n_path, source_i18n_path_relative)
 
-            if not os.path.exists(game_pak_filename):
-                Log.warn(f'Cannot find game package: "{game_pak_filename}"')
-                Log.warn(f'Skipped patching: "{project_xml_path}"')
-                continue
+        Log.info(f'Patching XML file: "{source_i18n_path_relative}"')
+        Log.debug(f'project_xml_path="{project_xml_path}"', prefix='\t')
+
+        with Profiler.measure('parse_project', source_i18n_path_relative):
+            project_tree: etree.ElementTree = etree.parse(project_xml_path, XML_PARSER)
+            project_rows: list = PRECOMPILED_XPATH_ROW(project_tree)
 
-            # we don't want to open the same game pak more than once
-            if game_pak_filename not in game_paks:
-                game_paks.update({
-                    game_pak_filename: ZipFileFixed(game_pak_filename)
-                })
+        if len(project_rows) == 0:
+            Log.warn(f'No rows found. Cannot patch: "{project_xml_path}"')
+            return None
 
-            with game_paks[game_pak_filename].open(file_name) as f:
-                game_tree = etree.parse(f, XML_PARSER)
-                game_xpath = etree.XPathEvaluator(game_tree)
+        project_table = project_rows[0].getparent()
 
+        # read zipped pak xml
+        game_pak_filename = os.path.join(self.settings.game_path, 'Localization', parent_path + '.pak')
+
+        if not os.path.exists(game_pak_filename):
+            Log.warn(f'Cannot find game package: "{game_pak_filename}"')
+            Log.warn(f'Skipped patching: "{project_xml_path}"')
+            return None
+
+        game_pak = self._get_game_pak(game_pak_filename)
+
+        manifest_key, fingerprint = None, None
+
+        if self.build_manifest:
+            manifest_key = fix_slashes(self.settings.make_project_relative(project_xml_path))
+
+            fingerprint = self._get_fingerprint(xml_file, game_pak.getinfo(file_name).CRC, ('Row',))
+
+            if self.build_manifest.is_current(manifest_key, fingerprint, target_i18n_path_absolute):
+                Log.info('Unchanged since last build. Reusing previous output.', prefix='\t')
+                return None
+
+        with Profiler.measure('parse_vanilla', source_i18n_path_relative):
+            game_cells, duplicate_keys = self.game_cache.load(game_pak, game_pak_filename, file_name,
+                                                              ('Row',), self.iter_localization)
+
+        with Profiler.measure('diff', source_i18n_path_relative):
             duplicate_rows = set()
 
             for project_row in project_rows:
@@ -199,30 +516,207 @@ class Patcher:
                 else:
                     project_key, project_source, _ = (c.text for c in list(project_row))
 
-                matching_cells: list = game_xpath(f'//Row/Cell[text()="{project_key}"]')
+                game_cell: tuple = game_cells.get(project_key)
 
-                if len(matching_cells) == 0:
+                if game_cell is None:
                     continue
 
-                if len(matching_cells) > 1:
+                if project_key in duplicate_keys:
                     raise Exception('Too many matching rows in game tree')
 
-                game_row = matching_cells[0].getparent()
-                _, game_source, game_translation = (c.text for c in list(game_row))
+                game_source, game_translation = game_cell
 
                 if any(project_source == text for text in [game_source, game_translation]):
                     project_table.remove(project_row)
                     duplicate_rows.add(project_key)
 
-            if (count := len(duplicate_rows)) > 0:
-                Log.warn(f'Removed {count} duplicate rows.', prefix='\t')
+        if (count := len(duplicate_rows)) > 0:
+            Log.warn(f'Removed {count} duplicate rows.', prefix='\t')
+
+        output_root = project_tree.getroot()
+
+        with Profiler.measure('write_xml', source_i18n_path_relative):
+            output_tree = etree.ElementTree(output_root, parser=XML_PARSER_ALLOW_COMMENTS)
+            output_data: bytes = self._serialize_output(output_tree)
+
+        return manifest_key, fingerprint, target_i18n_path_absolute, output_data
+
+    def _prefetch(self, index_method: Callable[[str], tuple], xml_file: str) -> list:
+        """Loads the vanilla index of a file on the prefetch thread. Returns its log lines, to be replayed in order."""
+        with Log.capture() as log_lines:
+            try:
+                index_arguments: tuple = index_method(xml_file)
+
+                if index_arguments:
+                    self.game_cache.load(*index_arguments)
+            except Exception:
+                # patching the file on the calling thread fails with the same error, and reports it
+                pass
+
+        return log_lines
+
+    def _iter_prefetched_results(self, patch_method: Callable[[str], tuple], index_method: Callable[[str], tuple],
+                                 xml_file_list: list) -> Generator:
+        """Patches files in order, while a thread loads the vanilla indexes of the next files"""
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            pending_files: Iterator = iter(xml_file_list)
+            futures: deque = deque(prefetcher.submit(self._prefetch, index_method, xml_file)
+                                   for xml_file in islice(pending_files, self.PREFETCH_DEPTH))
+
+            for xml_file in xml_file_list:
+                next_file: str = next(pending_files, None)
+
+                if next_file is not None:
+                    futures.append(prefetcher.submit(self._prefetch, index_method, next_file))
+
+                Log.write(futures.popleft().result())
+
+                yield patch_method(xml_file)
+
+    def _store_outputs(self, output_queue: queue.Queue, errors: list) -> None:
+        """Stores results taken from output_queue on the writer thread, until None is taken"""
+        while (result := output_queue.get()) is not None:
+            # keep draining after an error, so the patching thread is never blocked on a full queue
+            if errors:
+                continue
+
+            manifest_key, fingerprint, output_path, output_data = result
+
+            try:
+                self._store_output(output_path, output_data)
+            except Exception as e:
+                errors.append(e)
+                continue
+
+            if self.build_manifest:
+                self.build_manifest.update(manifest_key, fingerprint, output_path)
+
+    def _publish_indexes(self, index_method: Callable[[str], tuple], xml_file_list: list) -> tuple:
+        """
+        Loads the vanilla indexes of files once, and copies them into shared memory for worker processes.
+        Returns the published dict for GameCache, and the shared memory blocks to unlink once workers are done.
+        """
+        published: dict = {}
+        blocks: list = []
+
+        for xml_file in xml_file_list:
+            try:
+                index_arguments: tuple = index_method(xml_file)
+            except Exception:
+                # the worker patching the file fails with the same error, and reports it
+                continue
+
+            if not index_arguments:
+                continue
+
+            game_pak, game_pak_path, arcname, signature, _ = index_arguments
+
+            if self.game_cache.get_key(game_pak_path, arcname, signature) in published:
+                continue
+
+            try:
+                key, stamp, block = self.game_cache.publish(*index_arguments)
+            except OSError as e:
+                # workers load the index themselves instead
+                Log.warn(f'Cannot share vanilla index of "{arcname}" with workers ({e})', prefix='\t')
+                continue
+
+            published[key] = (stamp, block.name)
+            blocks.append(block)
+
+        return published, blocks
+
+    def _patch_files(self, patch_method: Callable[[str], tuple], index_method: Callable[[str], tuple],
+                     xml_file_list: list) -> None:
+        """
+        Patches files in order, or across a process pool when more than one job is requested. Vanilla indexes are
+        prefetched when they are cached, and outputs are stored, on their own threads, so reading, diffing and writing
+        overlap. Worker processes read vanilla indexes from shared memory instead, so each index is only loaded once.
+        """
+        jobs: int = min(self.settings.options.jobs or os.cpu_count() or 1, len(xml_file_list))
+        blocks: list = []
+
+        if jobs <= 1 and not self._is_indexed_fully():
+            # without the cache, indexes are loaded for one file at a time, so there is nothing to load ahead
+            results = map(patch_method, xml_file_list)
+        elif jobs <= 1:
+            results = self._iter_prefetched_results(patch_method, index_method, xml_file_list)
+        else:
+            published, blocks = self._publish_indexes(index_method, xml_file_list)
+
+            executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                           initargs=(self.settings, self.build_manifest, Profiler.enabled, published))
+
+            # results are yielded in submission order so the log is deterministic
+            results = self._replay_worker_results(executor.map(_run_worker, repeat(patch_method.__name__), xml_file_list,
+                                                               [self._fingerprints.get(f) for f in xml_file_list]))
+
+        # bounded, so patched files that are slow to write do not pile up in memory
+        output_queue: queue.Queue = queue.Queue(maxsize=self.OUTPUT_QUEUE_SIZE)
+        writer_errors: list = []
+
+        writer = threading.Thread(target=self._store_outputs, args=(output_queue, writer_errors), daemon=True)
+        writer.start()
+
+        try:
+            for result in results:
+                if result:
+                    output_queue.put(result)
+        finally:
+            output_queue.put(None)
+            writer.join()
+
+            if jobs > 1:
+                executor.shutdown()
+            self.close()
+
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        if writer_errors:
+            raise writer_errors[0]
+
+    @staticmethod
+    def _replay_worker_results(worker_results: Iterable) -> Generator:
+        for log_lines, records, result in worker_results:
+            Log.write(log_lines)
+            Profiler.extend(records)
+            yield result
+
+    def patch_data(self, xml_file_list: list) -> None:
+        self._patch_files(self._patch_data_file, self._get_data_index, xml_file_list)
+
+        if self.build_manifest:
+            self.build_manifest.prune('Data/', {fix_slashes(self.settings.make_project_relative(f)) for f in xml_file_list})
+            self.build_manifest.save()
+
+    def patch_localization(self, xml_file_list: list) -> None:
+        # filter out unsupported xml files - we can arbitrarily add these later but we can't patch them
+        xml_file_list = [f for f in xml_file_list if os.path.basename(f) in self.settings.localization]
+
+        self._patch_files(self._patch_localization_file, self._get_localization_index, xml_file_list)
+
+        if self.build_manifest:
+            self.build_manifest.prune('Localization/', {fix_slashes(self.settings.make_project_relative(f)) for f in xml_file_list})
+            self.build_manifest.save()
+
+
+# each worker process patches files with its own patcher and game pak handles
+_worker_patcher: Patcher = None
+
+
+def _init_worker(settings: ProjectSettings, build_manifest: BuildManifest, profile: bool, published: dict) -> None:
+    global _worker_patcher
+    _worker_patcher = Patcher(settings, GameCache(settings.cache_path, published=published), build_manifest)
+    Profiler.enabled = profile
 
-            output_root = self.find_root(project_rows[0], 'Table')
 
-            with open(target_i18n_path_absolute, 'w', encoding='utf-8'):
-                output_tree = etree.ElementTree(output_root, parser=XML_PARSER_ALLOW_COMMENTS)
-                output_tree.write(target_i18n_path_absolute, encoding='utf-8', pretty_print=True)
+def _run_worker(method_name: str, xml_file: str, fingerprint: tuple) -> tuple:
+    # the fingerprint taken when the main process published vanilla indexes, if any
+    if fingerprint is not None:
+        _worker_patcher._fingerprints[xml_file] = fingerprint
 
-        # close game paks open in memory
-        for pak_file_path in game_paks:
-            game_paks[pak_file_path].close()
+    with Log.capture() as log_lines:
+        result = getattr(_worker_patcher, method_name)(xml_file)
+    return log_lines, Profiler.collect(), result
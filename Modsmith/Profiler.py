@@ -0,0 +1,166 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Generator
+
+
+class Profiler:
+    enabled: bool = False
+
+    # current RSS is sampled this often while blocks are measured, so each block reports the peak reached inside it
+    SAMPLE_INTERVAL: float = 0.01
+
+    # measurements are appended by any thread and collected by the main process
+    _records: list = []
+    _lock = threading.Lock()
+
+    # peak RSS of each block being measured, keyed by a token per block, and the process sampling them
+    _active_peaks: dict = {}
+    _sampler_pid: int = 0
+
+    @staticmethod
+    def get_rss() -> int:
+        """Returns the current resident set size of the process in bytes"""
+        if sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+
+            class ProcessMemoryCounters(ctypes.Structure):
+                _fields_ = [('cb', wintypes.DWORD),
+                            ('PageFaultCount', wintypes.DWORD),
+                            ('PeakWorkingSetSize', ctypes.c_size_t),
+                            ('WorkingSetSize', ctypes.c_size_t),
+                            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                            ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                            ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                            ('PagefileUsage', ctypes.c_size_t),
+                            ('PeakPagefileUsage', ctypes.c_size_t)]
+
+            counters = ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+
+            get_process_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+            get_process_memory_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD]
+
+            if not get_process_memory_info(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+                return 0
+
+            return counters.WorkingSetSize
+
+        try:
+            with open('/proc/self/statm', 'rb') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            pass
+
+        import resource
+
+        # without procfs, e.g. on macos, only the peak of the whole process is known
+        peak_rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # linux reports kilobytes, macos reports bytes
+        return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+
+    @staticmethod
+    def _sample() -> None:
+        """Raises the peak of every measured block to the current RSS, until no blocks are measured"""
+        while True:
+            rss: int = Profiler.get_rss()
+
+            with Profiler._lock:
+                if not Profiler._active_peaks:
+                    Profiler._sampler_pid = 0
+                    return
+
+                for token, peak_rss in Profiler._active_peaks.items():
+                    Profiler._active_peaks[token] = max(peak_rss, rss)
+
+            time.sleep(Profiler.SAMPLE_INTERVAL)
+
+    @staticmethod
+    def _start_block() -> object:
+        token = object()
+        rss: int = Profiler.get_rss()
+
+        with Profiler._lock:
+            # forked worker processes start their own sampler, as threads are not inherited, and drop blocks that only
+            # the parent process will end
+            if Profiler._sampler_pid != os.getpid():
+                Profiler._active_peaks = {}
+                Profiler._sampler_pid = os.getpid()
+                threading.Thread(target=Profiler._sample, daemon=True).start()
+
+            Profiler._active_peaks[token] = rss
+
+        return token
+
+    @staticmethod
+    def _end_block(token: object) -> int:
+        """Returns the peak RSS sampled while the block ran"""
+        rss: int = Profiler.get_rss()
+
+        with Profiler._lock:
+            return max(Profiler._active_peaks.pop(token), rss)
+
+    @staticmethod
+    @contextmanager
+    def measure(phase: str, file_path: str = '') -> Generator:
+        """Records wall time, CPU time and peak RSS of the enclosed block, if profiling is enabled"""
+        if not Profiler.enabled:
+            yield
+            return
+
+        token: object = Profiler._start_block()
+
+        wall_time: float = time.perf_counter()
+        cpu_time: float = time.process_time()
+
+        try:
+            yield
+        finally:
+            record = {
+                'phase'    : phase,
+                'file'     : file_path,
+                'pid'      : os.getpid(),
+                'wall_time': time.perf_counter() - wall_time,
+                'cpu_time' : time.process_time() - cpu_time,
+                'peak_rss' : Profiler._end_block(token)
+            }
+
+            with Profiler._lock:
+                Profiler._records.append(record)
+
+    @staticmethod
+    def collect() -> list:
+        """Removes and returns measurements recorded so far"""
+        with Profiler._lock:
+            records, Profiler._records = Profiler._records, []
+        return records
+
+    @staticmethod
+    def extend(records: list) -> None:
+        """Adds measurements recorded by another process"""
+        with Profiler._lock:
+            Profiler._records.extend(records)
+
+    @staticmethod
+    def write_report(report_path: str) -> None:
+        """Writes measurements, and per-phase totals, to a JSON file"""
+        records: list = Profiler.collect()
+        phases: dict = {}
+
+        for record in records:
+            phase: dict = phases.setdefault(record['phase'], {'count': 0, 'wall_time': 0.0, 'cpu_time': 0.0, 'peak_rss': 0})
+            phase['count'] += 1
+            phase['wall_time'] += record['wall_time']
+            phase['cpu_time'] += record['cpu_time']
+            phase['peak_rss'] = max(phase['peak_rss'], record['peak_rss'])
+
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump({'phases': phases, 'records': records}, f, indent=2)
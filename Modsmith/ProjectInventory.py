@@ -0,0 +1,112 @@
+import os
+from dataclasses import dataclass
+from typing import (Iterator,
+                    List)
+
+from modsmith import (ProjectSettings,
+                      fix_slashes)
+
+
+@dataclass(frozen=True)
+class InventoryEntry:
+    path: str
+    relative_path: str
+    size: int
+    mtime_ns: int
+    kind: str
+
+
+class ProjectInventory:
+    DATA_XML: str = 'data_xml'
+    DATA_XML_EXCLUDED: str = 'data_xml_excluded'
+    DATA_ASSET: str = 'data_asset'
+    DATA_TBL: str = 'data_tbl'
+    I18N_XML: str = 'i18n_xml'
+    PAK: str = 'pak'
+    OTHER: str = 'other'
+
+    def __init__(self, settings: ProjectSettings) -> None:
+        """
+        Lists and classifies project files in one walk of the project root, on first use
+        :param settings: Settings for the project to walk
+        """
+        self.settings: ProjectSettings = settings
+
+        self._entries: List[InventoryEntry] = None
+        self._i18n_folders: List[str] = None
+
+    @staticmethod
+    def walk(root_path: str, skip_paths: tuple = ()) -> Iterator[os.DirEntry]:
+        """Yields files below root_path in name order, skipping hidden entries like glob does"""
+        try:
+            with os.scandir(root_path) as it:
+                entries: list = sorted(it, key=lambda e: e.name)
+        except (FileNotFoundError, NotADirectoryError):
+            return
+
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+
+            if entry.is_dir():
+                if os.path.normcase(entry.path) not in skip_paths:
+                    yield from ProjectInventory.walk(entry.path, skip_paths)
+            elif entry.is_file():
+                yield entry
+
+    def _classify(self, relative_path: str) -> str:
+        if relative_path.endswith('.pak'):
+            return self.PAK
+
+        top_folder, _, path = relative_path.partition('/')
+
+        if top_folder == 'Data' and path:
+            if relative_path.endswith('.tbl'):
+                return self.DATA_TBL
+            if not relative_path.endswith('.xml'):
+                return self.DATA_ASSET
+            if self.settings.config.is_excluded(relative_path):
+                return self.DATA_XML_EXCLUDED
+            return self.DATA_XML
+
+        # localization files are only read from language folders, e.g. Localization/english_xml/*.xml
+        if top_folder == 'Localization' and path.count('/') == 1 and relative_path.endswith('.xml'):
+            return self.I18N_XML
+
+        return self.OTHER
+
+    def _scan(self) -> None:
+        self._entries = []
+
+        # build output is not project input
+        skip_paths: tuple = (os.path.normcase(self.settings.project_build_path),)
+
+        for entry in self.walk(self.settings.project_path, skip_paths):
+            relative_path: str = fix_slashes(os.path.relpath(entry.path, self.settings.project_path))
+            stat: os.stat_result = entry.stat()
+
+            self._entries.append(InventoryEntry(entry.path, relative_path, stat.st_size, stat.st_mtime_ns,
+                                                self._classify(relative_path)))
+
+        try:
+            with os.scandir(self.settings.project_i18n_path) as it:
+                self._i18n_folders = sorted(e.name for e in it if e.is_dir() and not e.name.startswith('.'))
+        except (FileNotFoundError, NotADirectoryError):
+            self._i18n_folders = []
+
+    @property
+    def entries(self) -> List[InventoryEntry]:
+        if self._entries is None:
+            self._scan()
+        return self._entries
+
+    @property
+    def i18n_folders(self) -> List[str]:
+        """Returns names of language folders in the Localization folder"""
+        if self._i18n_folders is None:
+            self._scan()
+        return self._i18n_folders
+
+    def get_paths(self, *kinds: str) -> List[str]:
+        """Returns absolute paths of files of the given kinds"""
+        return [entry.path for entry in self.entries if entry.kind in kinds]
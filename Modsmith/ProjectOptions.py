@@ -20,7 +20,17 @@ class ProjectOptions:
     pak_file_name: str = field(init=False, default_factory=lambda: '')
     zip_file_name: str = field(init=False, default_factory=lambda: '')
 
+    game_path: str = field(init=False, default_factory=lambda: '')
+
     pack_assets: bool = field(init=False, default_factory=lambda: False)
+    no_cache: bool = field(init=False, default_factory=lambda: False)
+    incremental: bool = field(init=False, default_factory=lambda: False)
+    watch: bool = field(init=False, default_factory=lambda: False)
+    keep_build_tree: bool = field(init=False, default_factory=lambda: False)
+    compression_level: int = field(init=False, default_factory=lambda: 6)
+    jobs: int = field(init=False, default_factory=lambda: 1)
+    profile: bool = field(init=False, default_factory=lambda: False)
+    profile_stats: bool = field(init=False, default_factory=lambda: False)
     debug: bool = field(init=False, default_factory=lambda: False)
 
     def __post_init__(self) -> None:
@@ -30,6 +40,20 @@ class ProjectOptions:
         if not os.path.exists(self.config_path):
             self.config_path = os.path.normpath(os.path.join(cwd, '..', 'kingdomcome.yaml'))
 
+        self.game_path = self._args.game_path
+        self.no_cache = self._args.no_cache
+        self.watch = self._args.watch
+        self.compression_level = self._args.compression_level
+
+        # watch mode rebuilds only changed files, so it reuses outputs like an incremental build
+        self.incremental = self._args.incremental or self.watch
+
+        # incremental builds reuse patched files, so they must be written to the build folder
+        self.keep_build_tree = self._args.keep_build_tree or self.incremental
+        self.jobs = self._args.jobs
+        self.profile = self._args.profile
+        self.profile_stats = self._args.profile_stats
+
         self.manifest_path = self._args.manifest_path
         if not os.path.exists(self.manifest_path):
             return
@@ -2,16 +2,16 @@ import os
 from dataclasses import (dataclass,
                          field)
 
-from yaml import (CLoader,
-                  load)
-
-from modsmith import (ProjectOptions,
-                      Registry)
+from modsmith import (GameConfig,
+                      GamePathResolver,
+                      ProjectOptions,
+                      get_user_cache_path)
 
 
 @dataclass
 class ProjectSettings:
     options: ProjectOptions = field(init=True, default_factory=None)
+    config: GameConfig = field(init=True, default=None, repr=False)
 
     game_path: str = field(init=False, default_factory=lambda: '')
     project_manifest_path: str = field(init=False, default_factory=lambda: '')
@@ -20,6 +20,10 @@ class ProjectSettings:
     project_i18n_path: str = field(init=False, default_factory=lambda: '')
     project_build_path: str = field(init=False, default_factory=lambda: '')
 
+    cache_path: str = field(init=False, default_factory=lambda: '')
+    pak_index_path: str = field(init=False, default_factory=lambda: '')
+    config_snapshot_path: str = field(init=False, default_factory=lambda: '')
+
     pak_extension: str = field(init=False, default_factory=lambda: '')
 
     zip_name: str = field(init=False, default_factory=lambda: '')
@@ -30,6 +34,9 @@ class ProjectSettings:
     build_localization_path: str = field(init=False, default_factory=lambda: '')
     build_zip_file_path: str = field(init=False, default_factory=lambda: '')
     build_zip_folder_path: str = field(init=False, default_factory=lambda: '')
+    build_manifest_path: str = field(init=False, default_factory=lambda: '')
+    build_profile_path: str = field(init=False, default_factory=lambda: '')
+    build_profile_stats_path: str = field(init=False, default_factory=lambda: '')
 
     exclusions: list = field(init=False, default_factory=list)
     localization: list = field(init=False, default_factory=list)
@@ -39,7 +46,7 @@ class ProjectSettings:
     def __post_init__(self) -> None:
         """Sets up the necessary paths for building PAKs"""
 
-        self.game_path = Registry.get_installed_path()
+        self.game_path = GamePathResolver(self.options.game_path).resolve()
 
         self.project_path = self.options.project_path
         self.project_manifest_path = self.options.manifest_path
@@ -47,6 +54,11 @@ class ProjectSettings:
         self.project_build_path = os.path.join(self.project_path, 'Build')
         self.project_i18n_path = self.options.localization_path
 
+        # vanilla indexes are only cached in memory when disabled
+        self.cache_path = '' if self.options.no_cache else os.path.join(get_user_cache_path(), 'tables')
+        self.pak_index_path = '' if self.options.no_cache else os.path.join(get_user_cache_path(), 'paks')
+        self.config_snapshot_path = '' if self.options.no_cache else os.path.join(get_user_cache_path(), 'config')
+
         self.pak_file_name = self.options.pak_file_name[:-4].replace(' ', '_')
         self.pak_extension = self.options.pak_file_name[-4:]
 
@@ -68,16 +80,20 @@ class ProjectSettings:
 
         self.zip_manifest_arc_name = os.path.join(self.pak_file_name, 'mod.manifest')
 
+        self.build_manifest_path = os.path.join(self.project_build_path, 'manifest.json')
+        self.build_profile_path = os.path.join(self.project_build_path, 'profile.json')
+        self.build_profile_stats_path = os.path.join(self.project_build_path, 'profile.pstats')
+
         # ---------------------------------------------------------------------
         # DATABASE INITIALIZATION
         # ---------------------------------------------------------------------
-        with open(self.options.config_path, mode='r') as f:
-            db: dict = load(f, Loader=CLoader)
+        if self.config is None:
+            self.config = GameConfig.load(self.options.config_path, self.config_snapshot_path)
 
-        self.exclusions: list = db['Exclusions']
-        self.localization: list = db['Localization']
-        self.packages: dict = db['Packages']
-        self.signatures: list = db['Signatures']
+        self.exclusions: list = self.config.exclusions
+        self.localization: list = self.config.localization
+        self.packages: dict = self.config.packages
+        self.signatures: list = self.config.signatures
 
     def make_project_relative(self, path: str) -> str:
         return os.path.relpath(path, self.project_path)
@@ -0,0 +1,98 @@
+import os
+import time
+
+from modsmith import (GameCache,
+                      Packager,
+                      ProjectInventory,
+                      ProjectSettings,
+                      SimpleLogger as Log)
+
+
+class ProjectWatcher:
+    # seconds between scans of the project tree
+    POLL_INTERVAL: float = 0.5
+
+    DATA_KINDS: tuple = (ProjectInventory.DATA_XML, ProjectInventory.DATA_XML_EXCLUDED, ProjectInventory.DATA_ASSET)
+
+    def __init__(self, settings: ProjectSettings, game_cache: GameCache) -> None:
+        """
+        Rebuilds the PAKs affected by each change to project files, until interrupted
+        :param settings: Settings for the project to watch
+        :param game_cache: Vanilla indexes kept in memory between rebuilds
+        """
+        self.settings: ProjectSettings = settings
+        self.game_cache: GameCache = game_cache
+
+    @staticmethod
+    def _snapshot(inventory: ProjectInventory) -> dict:
+        return {entry.relative_path: (entry.size, entry.mtime_ns, entry.kind) for entry in inventory.entries}
+
+    @staticmethod
+    def _find_changes(previous: dict, current: dict) -> dict:
+        """Returns kinds of files added, changed or removed, keyed by project relative path"""
+        changes: dict = {}
+
+        for relative_path in previous.keys() | current.keys():
+            previous_entry: tuple = previous.get(relative_path)
+            current_entry: tuple = current.get(relative_path)
+
+            if previous_entry != current_entry:
+                changes[relative_path] = (current_entry or previous_entry)[2]
+
+        return changes
+
+    def _rebuild(self, inventory: ProjectInventory, changes: dict) -> None:
+        packager: Packager = Packager(self.settings, self.game_cache)
+        packager.inventory = inventory
+
+        kinds: set = set(changes.values())
+
+        if 'mod.manifest' in changes:
+            Log.warn('Restart watch mode to apply changes to mod.manifest.')
+
+        # unchanged files reuse their previous output, so only touched files are patched
+        if kinds.intersection(self.DATA_KINDS) and os.path.exists(self.settings.project_data_path):
+            packager.generate_pak()
+
+        if ProjectInventory.I18N_XML in kinds and os.path.exists(self.settings.project_i18n_path):
+            packager.generate_i18n()
+
+        packager.pack()
+
+    def run(self) -> int:
+        inventory: ProjectInventory = ProjectInventory(self.settings)
+        snapshot: dict = self._snapshot(inventory)
+
+        Log.info('Watching for changes. Press Ctrl+C to stop.', prefix=os.linesep)
+
+        try:
+            while True:
+                time.sleep(self.POLL_INTERVAL)
+
+                current_inventory: ProjectInventory = ProjectInventory(self.settings)
+                current_snapshot: dict = self._snapshot(current_inventory)
+
+                changes: dict = self._find_changes(snapshot, current_snapshot)
+
+                if not changes:
+                    continue
+
+                inventory, snapshot = current_inventory, current_snapshot
+
+                for relative_path in sorted(changes):
+                    Log.info(f'Changed: "{relative_path}"', prefix=os.linesep)
+
+                started: float = time.perf_counter()
+
+                # keep watching after failed builds, e.g. while a file is only partly edited
+                try:
+                    self._rebuild(inventory, changes)
+                except Exception as e:
+                    Log.error(f'Rebuild failed: {e!r}', prefix=os.linesep)
+                    continue
+
+                Log.info(f'Rebuilt in {time.perf_counter() - started:.2f}s. Watching for changes...', prefix=os.linesep)
+        except KeyboardInterrupt:
+            Log.info('Stopped watching.', prefix=os.linesep)
+
+        return 0
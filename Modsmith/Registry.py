@@ -3,13 +3,6 @@ import os
 from dataclasses import (dataclass,
                          field)
 
-from winreg import (EnumValue,
-                    HKEYType,
-                    HKEY_LOCAL_MACHINE,
-                    KEY_READ,
-                    OpenKey,
-                    QueryInfoKey)
-
 
 @dataclass
 class Registry:
@@ -30,6 +23,17 @@ class Registry:
         Raises FileNotFoundError if the installed path cannot be found.
         """
 
+        # winreg is only available on windows, so don't require it until the registry is searched
+        try:
+            from winreg import (EnumValue,
+                                HKEYType,
+                                HKEY_LOCAL_MACHINE,
+                                KEY_READ,
+                                OpenKey,
+                                QueryInfoKey)
+        except ImportError:
+            raise FileNotFoundError('Cannot find installed path for game without Windows Registry')
+
         subkey_data: list = [
             r'SOFTWARE/Wow6432Node/GOG.com/Games/1719198803/path',
             r'SOFTWARE/Microsoft/Windows/CurrentVersion/Uninstall/Steam App 379430/InstallLocation'
@@ -0,0 +1,239 @@
+import ast
+import mmap
+import pickle
+import struct
+import zlib
+from array import array
+from collections.abc import Mapping
+from itertools import chain
+from multiprocessing import shared_memory
+from typing import (Any,
+                    Iterable,
+                    Iterator)
+
+
+class SharedIndex(Mapping):
+    # bump when the layout of packed indexes changes
+    VERSION: int = 3
+
+    MAGIC: bytes = b'MSSI'
+    HEADER: struct.Struct = struct.Struct('=4sIQQQ')
+
+    # marks a slot of the hash table that holds no entry
+    EMPTY_SLOT: int = 0xFFFFFFFF
+
+    def __init__(self, buffer: Any, owner: Any = None) -> None:
+        """
+        Read-only view of a packed index, which decodes only the entries that are looked up. The index can be held in
+        memory, in a memory-mapped cache file or in shared memory, so vanilla tables do not cost a dict entry per row.
+        :param buffer: Packed index, see pack
+        :param owner: Object holding the buffer, such as an mmap or shared memory block, closed along with the index.
+                      If the buffer is not a valid index, ValueError is raised and the caller must close the owner.
+        """
+        self._owner: Any = owner
+        self._buffer: memoryview = memoryview(buffer)
+
+        try:
+            magic, version, self._count, slot_count, duplicates_size = self.HEADER.unpack_from(self._buffer, 0)
+
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError('Not a packed index, or packed by another version')
+
+            offsets_end: int = self.HEADER.size + (2 * self._count + 1) * 8
+            slots_end: int = offsets_end + slot_count * 4
+
+            if slots_end > len(self._buffer):
+                raise ValueError('Truncated packed index')
+
+            # probes stop at an empty slot, so there must be one
+            if slot_count & (slot_count - 1) or slot_count <= self._count:
+                raise ValueError('Corrupt packed index (bad hash table size)')
+
+            # entry i is a key at [offsets[2i], offsets[2i + 1]) and a value at [offsets[2i + 1], offsets[2i + 2]) in data
+            self._offsets: memoryview = self._buffer[self.HEADER.size:offsets_end].cast('Q')
+
+            # open addressing table of entry positions, probed linearly from the CRC32 of an encoded key
+            self._slots: memoryview = self._buffer[offsets_end:slots_end].cast('I')
+            self._slot_mask: int = slot_count - 1
+
+            duplicates_start: int = slots_end + self._offsets[-1]
+
+            if duplicates_start + duplicates_size > len(self._buffer):
+                raise ValueError('Truncated packed index')
+
+            self._data: memoryview = self._buffer[slots_end:duplicates_start]
+            self.duplicate_keys: frozenset = pickle.loads(self._buffer[duplicates_start:duplicates_start + duplicates_size])
+        except (struct.error, pickle.UnpicklingError, EOFError) as e:
+            self._detach()
+            raise ValueError(f'Corrupt packed index ({e})') from e
+        except ValueError:
+            self._detach()
+            raise
+
+        # the buffer may be larger than the index, e.g. a shared memory block rounded up to a page
+        self.buffer: memoryview = self._buffer[:duplicates_start + duplicates_size]
+
+    @staticmethod
+    def encode_key(key: Any) -> bytes:
+        # keys are strings, None, or tuples of them, whose reprs are unambiguous
+        return repr(key).encode('utf-8', 'surrogatepass')
+
+    @staticmethod
+    def pack(items: Iterable) -> bytearray:
+        """
+        Packs (key, value) pairs into one buffer, keeping the first value of keys shared by more than one pair. Values are
+        encoded as they are read, so an index can be packed from a stream of rows without holding them all as objects.
+        :param items: Pairs of signature key or string key, and row attributes or cells
+        """
+        entries: dict = {}
+        duplicate_keys: set = set()
+
+        for key, value in items:
+            key_data: bytes = SharedIndex.encode_key(key)
+
+            if key_data in entries:
+                duplicate_keys.add(key)
+                continue
+
+            entries[key_data] = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        key_datas: list = sorted(entries)
+
+        offsets = array('Q')
+        position: int = 0
+
+        for key_data in key_datas:
+            offsets.append(position)
+            position += len(key_data)
+            offsets.append(position)
+            position += len(entries[key_data])
+
+        offsets.append(position)
+
+        # at most half of the slots are used, so probes for missing keys stop early
+        slot_count: int = 1 << (2 * len(key_datas)).bit_length()
+        slot_mask: int = slot_count - 1
+        slots = array('I', [SharedIndex.EMPTY_SLOT]) * slot_count
+
+        for i, key_data in enumerate(key_datas):
+            slot: int = zlib.crc32(key_data) & slot_mask
+
+            while slots[slot] != SharedIndex.EMPTY_SLOT:
+                slot = (slot + 1) & slot_mask
+
+            slots[slot] = i
+
+        duplicates_data: bytes = pickle.dumps(frozenset(duplicate_keys), protocol=pickle.HIGHEST_PROTOCOL)
+
+        buffer = bytearray(SharedIndex.HEADER.size + len(offsets) * offsets.itemsize + len(slots) * slots.itemsize
+                           + position + len(duplicates_data))
+        SharedIndex.HEADER.pack_into(buffer, 0, SharedIndex.MAGIC, SharedIndex.VERSION, len(key_datas), slot_count,
+                                     len(duplicates_data))
+        position = SharedIndex.HEADER.size
+
+        # encoded values are dropped as they are copied, so the entries are not held twice
+        for data in chain((offsets.tobytes(), slots.tobytes()),
+                          (data for key_data in key_datas for data in (key_data, entries.pop(key_data))),
+                          (duplicates_data,)):
+            buffer[position:position + len(data)] = data
+            position += len(data)
+
+        return buffer
+
+    @staticmethod
+    def publish(buffer: Any) -> shared_memory.SharedMemory:
+        """
+        Copies a packed index into a new shared memory block. The caller owns the block, and must close and unlink it.
+        :param buffer: Packed index, e.g. the buffer of a loaded index
+        """
+        size: int = len(buffer)
+
+        block = shared_memory.SharedMemory(create=True, size=size)
+        block.buf[:size] = buffer
+
+        return block
+
+    @staticmethod
+    def attach(name: str) -> 'SharedIndex':
+        """Opens an index published in shared memory by another process, see publish"""
+        block = shared_memory.SharedMemory(name=name)
+
+        try:
+            return SharedIndex(block.buf, block)
+        except ValueError:
+            block.close()
+            raise
+
+    @staticmethod
+    def map_file(file_path: str, offset: int, size: int) -> 'SharedIndex':
+        """Opens a packed index stored in a file at offset, which is read from the page cache as entries are looked up"""
+        with open(file_path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if offset + size > len(mapping):
+            mapping.close()
+            raise ValueError(f'Truncated packed index: {file_path}')
+
+        try:
+            # the views are released before the mapping is closed on failure, as it cannot be closed while they exist
+            with memoryview(mapping) as view, view[offset:offset + size] as buffer:
+                return SharedIndex(buffer, mapping)
+        except ValueError:
+            mapping.close()
+            raise
+
+    def _detach(self) -> None:
+        """Releases the views into the buffer, and leaves closing the owner to the caller"""
+        # the owner cannot be closed while views into it exist
+        for name in ('_offsets', '_slots', '_data', 'buffer', '_buffer'):
+            view: memoryview = self.__dict__.pop(name, None)
+
+            if view is not None:
+                view.release()
+
+        self._owner = None
+
+    def close(self) -> None:
+        """Detaches from the buffer, after which entries can no longer be looked up"""
+        owner: Any = self._owner
+        self._detach()
+
+        if owner is not None:
+            owner.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def _get_key_data(self, i: int) -> bytes:
+        return bytes(self._data[self._offsets[2 * i]:self._offsets[2 * i + 1]])
+
+    def _find(self, key: Any) -> int:
+        """Returns the position of an entry, found through the hash table of encoded keys, or -1"""
+        key_data: bytes = self.encode_key(key)
+        slot: int = zlib.crc32(key_data) & self._slot_mask
+
+        while (i := self._slots[slot]) != self.EMPTY_SLOT:
+            if self._get_key_data(i) == key_data:
+                return i
+
+            slot = (slot + 1) & self._slot_mask
+
+        return -1
+
+    def __getitem__(self, key: Any) -> Any:
+        i: int = self._find(key)
+
+        if i < 0:
+            raise KeyError(key)
+
+        return pickle.loads(self._data[self._offsets[2 * i + 1]:self._offsets[2 * i + 2]])
+
+    def __contains__(self, key: Any) -> bool:
+        return self._find(key) >= 0
+
+    def __iter__(self) -> Iterator:
+        for i in range(self._count):
+            yield ast.literal_eval(self._get_key_data(i).decode('utf-8', 'surrogatepass'))
+
+    def __len__(self) -> int:
+        return self._count
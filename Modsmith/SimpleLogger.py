@@ -1,22 +1,55 @@
 import sys
+import threading
+from contextlib import contextmanager
+from typing import Generator
 
 from colorama import Fore
 
 
 class SimpleLogger:
+    # messages are collected here instead of printed while a thread is capturing
+    _local = threading.local()
+
+    @staticmethod
+    def _print(text: str) -> None:
+        lines: list = getattr(SimpleLogger._local, 'lines', None)
+
+        if lines is not None:
+            lines.append(text)
+        else:
+            print(text)
+
+    @staticmethod
+    @contextmanager
+    def capture() -> Generator:
+        """Collects messages logged by the current thread into a list instead of printing them"""
+        previous_lines: list = getattr(SimpleLogger._local, 'lines', None)
+        SimpleLogger._local.lines = []
+
+        try:
+            yield SimpleLogger._local.lines
+        finally:
+            SimpleLogger._local.lines = previous_lines
+
+    @staticmethod
+    def write(lines: list) -> None:
+        """Logs messages previously collected by capture"""
+        for line in lines:
+            SimpleLogger._print(line)
+
     @staticmethod
     def error(message: str, *, prefix: str = '', suffix: str = '') -> None:
-        print('%s%s[%s] %s%s%s' % (prefix, Fore.RED, 'ERRO', message, suffix, Fore.RESET))
+        SimpleLogger._print('%s%s[%s] %s%s%s' % (prefix, Fore.RED, 'ERRO', message, suffix, Fore.RESET))
 
     @staticmethod
     def info(message: str, *, prefix: str = '', suffix: str = '') -> None:
-        print('%s[%s] %s%s' % (prefix, 'INFO', message, suffix))
+        SimpleLogger._print('%s[%s] %s%s' % (prefix, 'INFO', message, suffix))
 
     @staticmethod
     def warn(message: str, *, prefix: str = '', suffix: str = '') -> None:
-        print('%s%s[%s] %s%s%s' % (prefix, Fore.YELLOW, 'WARN', message, suffix, Fore.RESET))
+        SimpleLogger._print('%s%s[%s] %s%s%s' % (prefix, Fore.YELLOW, 'WARN', message, suffix, Fore.RESET))
 
     @staticmethod
     def debug(message: str, *, prefix: str = '', suffix: str = '') -> None:
         if '--debug' in sys.argv:
-            print('%s%s[%s] %s%s%s' % (prefix, Fore.CYAN, 'DEBUG', message, suffix, Fore.RESET))
+            SimpleLogger._print('%s%s[%s] %s%s%s' % (prefix, Fore.CYAN, 'DEBUG', message, suffix, Fore.RESET))
@@ -1,21 +1,73 @@
-from modsmith.Constants import (PRECOMPILED_XPATH_CELL,
-                                PRECOMPILED_XPATH_ROW,
-                                PRECOMPILED_XPATH_ROWS,
-                                XML_PARSER,
-                                XML_PARSER_ALLOW_COMMENTS)
+import importlib
+import sys
+import types
 
-from modsmith.Common import (fix_slashes,
-                             to_version)
 
-from modsmith.Extensions import (HelpFormatterEx,
-                                 ZipFileFixed)
+class _LazyPackage(types.ModuleType):
+    """Package whose exported names import their modules on first use, so e.g. --help does not load lxml or yaml"""
 
-from modsmith.SimpleLogger import SimpleLogger  # sort before all non-extension classes
+    def __getattr__(self, name: str) -> object:
+        module_name: str = self.__dict__['_exports'].get(name)
 
-from modsmith.Registry import Registry  # sort before ProjectSettings
+        if module_name is None:
+            raise AttributeError(f'module {self.__name__!r} has no attribute {name!r}')
 
-from modsmith.ProjectOptions import ProjectOptions  # sort before ProjectSettings
-from modsmith.ProjectSettings import ProjectSettings
+        value: object = getattr(importlib.import_module(module_name), name)
+        self.__dict__[name] = value
+        return value
 
-from modsmith.Patcher import Patcher  # sort before Packager
-from modsmith.Packager import Packager
+    def __setattr__(self, name: str, value: object) -> None:
+        # importing a submodule binds it to the package, which would shadow the class of the same name
+        if isinstance(value, types.ModuleType) and value.__name__ == f'{self.__name__}.{name}':
+            return
+        super().__setattr__(name, value)
+
+    def __dir__(self) -> list:
+        return sorted(set(super().__dir__()) | self.__dict__['_exports'].keys())
+
+
+def _export_lazily(package_name: str, exports: dict) -> None:
+    """Exports names from the modules they map to, importing each module when one of its names is first used"""
+    package: types.ModuleType = sys.modules[package_name]
+    package._exports = exports
+    package.__class__ = _LazyPackage
+
+
+_export_lazily(__name__, {
+    'PRECOMPILED_XPATH_CELL'   : 'modsmith.Constants',
+    'PRECOMPILED_XPATH_ROW'    : 'modsmith.Constants',
+    'PRECOMPILED_XPATH_ROWS'   : 'modsmith.Constants',
+    'SHARED_PARSER_OPTIONS'    : 'modsmith.Constants',
+    'XML_PARSER'               : 'modsmith.Constants',
+    'XML_PARSER_ALLOW_COMMENTS': 'modsmith.Constants',
+
+    'fix_slashes'         : 'modsmith.Common',
+    'get_user_cache_path' : 'modsmith.Common',
+    'get_user_config_path': 'modsmith.Common',
+    'to_version'          : 'modsmith.Common',
+
+    'HelpFormatterEx': 'modsmith.Extensions',
+    'ZipFileFixed'   : 'modsmith.Extensions',
+
+    'SimpleLogger': 'modsmith.SimpleLogger',
+    'Profiler'    : 'modsmith.Profiler',
+
+    'Registry'        : 'modsmith.Registry',
+    'GamePathResolver': 'modsmith.GamePathResolver',
+
+    'GameConfig'     : 'modsmith.GameConfig',
+    'ProjectOptions' : 'modsmith.ProjectOptions',
+    'ProjectSettings': 'modsmith.ProjectSettings',
+
+    'BuildManifest'   : 'modsmith.BuildManifest',
+    'GamePak'         : 'modsmith.GamePak',
+    'GamePakIndex'    : 'modsmith.GamePak',
+    'SharedIndex'     : 'modsmith.SharedIndex',
+    'GameCache'       : 'modsmith.GameCache',
+    'Patcher'         : 'modsmith.Patcher',
+    'InventoryEntry'  : 'modsmith.ProjectInventory',
+    'ProjectInventory': 'modsmith.ProjectInventory',
+    'Packager'        : 'modsmith.Packager',
+    'ProjectWatcher'  : 'modsmith.ProjectWatcher',
+    'ConflictIndex'   : 'modsmith.ConflictIndex'
+})
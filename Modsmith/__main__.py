@@ -1,23 +1,96 @@
 import argparse
+import sys
 
 from modsmith import HelpFormatterEx
-from modsmith.Application import Application
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Modsmith',
+                                    formatter_class=HelpFormatterEx)
+
+    parser.add_argument('manifest_path',
+                        metavar='<path>', nargs='+',
+                        action='store', type=str,
+                        help='path to mod.manifest in project root, or several manifests or folders of projects to build in batch mode')
+
+    parser.add_argument('--pack-assets',
+                        action='store_true', default=False,
+                        help='add unsupported assets to package')
+
+    parser.add_argument('--game-path',
+                        metavar='<path>',
+                        action='store', default='', type=str,
+                        help='path to game install (default: MODSMITH_GAME_PATH, cached path, or Windows Registry)')
+
+    parser.add_argument('--compression-level',
+                        metavar='<level>', choices=range(10),
+                        action='store', default=6, type=int,
+                        help='deflate level for the ZIP from 1 (fastest) to 9 (smallest), or 0 to store files')
+
+    parser.add_argument('--jobs',
+                        metavar='<count>',
+                        action='store', default=1, type=int,
+                        help='number of processes used to patch files, or 0 for one per CPU')
+
+    parser.add_argument('--parallel',
+                        metavar='<count>',
+                        action='store', default=0, type=int,
+                        help='number of projects built at once in batch mode, or 0 for one per CPU')
+
+    parser.add_argument('--conflicts',
+                        action='store_true', default=False,
+                        help='instead of building, report table rows and attributes patched by more than one project')
+
+    parser.add_argument('--incremental',
+                        action='store_true', default=False,
+                        help='keep build folder and only patch changed files')
+
+    parser.add_argument('--keep-build-tree',
+                        action='store_true', default=False,
+                        help='write patched XML files to the Build folder for debugging (implied by --incremental)')
+
+    parser.add_argument('--watch',
+                        action='store_true', default=False,
+                        help='after building, rebuild the affected PAK whenever a project file changes')
+
+    parser.add_argument('--profile',
+                        action='store_true', default=False,
+                        help='write timings for each build phase and file to Build/profile.json')
+
+    parser.add_argument('--profile-stats',
+                        action='store_true', default=False,
+                        help='write cProfile stats to Build/profile.pstats')
+
+    parser.add_argument('--no-cache',
+                        action='store_true', default=False,
+                        help='do not read or write cached game tables, PAK member tables or config snapshots')
+
+    parser.add_argument('--debug',
+                        action='store_true', default=False,
+                        help='enable debug logging')
+
+    return parser
+
 
 if __name__ == '__main__':
-    _parser = argparse.ArgumentParser(description='Modsmith',
-                                      formatter_class=HelpFormatterEx)
+    import multiprocessing
+
+    multiprocessing.freeze_support()
 
-    _parser.add_argument('manifest_path',
-                         metavar='<path>', nargs=1,
-                         action='store', type=str,
-                         help='path to mod.manifest in project root')
+    args = create_parser().parse_args()
 
-    _parser.add_argument('--pack-assets',
-                         action='store_true', default=False,
-                         help='add unsupported assets to package')
+    # imported after parsing, so --help and argument errors do not load the application
+    from modsmith.Application import Application
+    from modsmith.BatchApplication import BatchApplication
+    from modsmith.ConflictIndex import ConflictIndex
 
-    _parser.add_argument('--debug',
-                         action='store_true', default=False,
-                         help='enable debug logging')
+    manifest_paths = BatchApplication.find_manifests(args.manifest_path)
 
-    Application(_parser.parse_args()).run()
+    if args.conflicts:
+        # the exit code is nonzero when conflicts are found, so the report can fail a CI job
+        sys.exit(ConflictIndex(args, manifest_paths).run())
+    elif len(manifest_paths) > 1:
+        BatchApplication(args, manifest_paths).run()
+    else:
+        args.manifest_path = manifest_paths or args.manifest_path
+        Application(args).run()
@@ -0,0 +1,354 @@
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import logging
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+import zipfile
+
+
+class Benchmark:
+    log: logging.Logger = logging.getLogger('modsmith')
+
+    # synthetic tables shaped like members of Tables.pak, keyed by path relative to Data
+    tables: dict = {
+        'Libs/Tables/item/armor.xml': {
+            'armor_type_id': 'integer',
+            'clothing_id'  : 'uuid',
+            'is_underwear' : 'boolean',
+            'item_id'      : 'uuid',
+            'max_status'   : 'integer',
+            'noise'        : 'real',
+            'slash_def'    : 'real',
+            'smash_def'    : 'real',
+            'stab_def'     : 'real',
+            'str_req'      : 'real'
+        },
+        'Libs/Tables/shop/shop_type2item.xml': {
+            'amount'      : 'real',
+            'default_on'  : 'boolean',
+            'item_id'     : 'uuid',
+            'shop_type_id': 'integer'
+        }
+    }
+
+    # synthetic localization files shaped like members of english_xml.pak
+    localization: tuple = ('text_ui_items.xml',)
+
+    # imports modsmith like _import_package and parses arguments like `modsmith --help`, without printing help
+    startup_code: str = '''
+import importlib.util, os, sys
+try:
+    import modsmith
+except ImportError:
+    package_path = os.path.join(sys.argv[1], 'Modsmith')
+    spec = importlib.util.spec_from_file_location('modsmith', os.path.join(package_path, '__init__.py'),
+                                                  submodule_search_locations=[package_path])
+    sys.modules['modsmith'] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(sys.modules['modsmith'])
+from modsmith.__main__ import create_parser
+create_parser().format_help()
+'''
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.root_path: str = os.path.dirname(os.path.abspath(__file__))
+
+        self.fixture_path: str = os.path.abspath(args.fixture_path)
+        self.output_path: str = os.path.abspath(args.output_path)
+        self.scales: list = sorted(args.rows)
+        self.project_ratio: float = args.project_ratio
+        self.modsmith_args: list = args.modsmith_args
+        self.verbose: bool = args.verbose
+        self.startup_runs: int = args.startup_runs
+        self.max_startup: float = args.max_startup
+
+        self.modsmith = self._import_package()
+        self.signatures: dict = self._load_signatures()
+
+    def _import_package(self) -> object:
+        """Imports modsmith, whose package folder is named Modsmith and cannot be found on case-sensitive file systems"""
+        try:
+            import modsmith
+            return modsmith
+        except ImportError:
+            pass
+
+        package_path: str = os.path.join(self.root_path, 'Modsmith')
+
+        spec = importlib.util.spec_from_file_location('modsmith', os.path.join(package_path, '__init__.py'),
+                                                      submodule_search_locations=[package_path])
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['modsmith'] = module
+        spec.loader.exec_module(module)
+
+        return module
+
+    def _load_signatures(self) -> dict:
+        from yaml import (CLoader,
+                          load)
+
+        with open(os.path.join(self.root_path, 'kingdomcome.yaml'), mode='r') as f:
+            db: dict = load(f, Loader=CLoader)
+
+        signatures: dict = {}
+
+        for signature in db['Signatures']:
+            signature_key: str = next(iter(signature))
+            signatures[signature_key] = signature[signature_key][0]
+
+        return signatures
+
+    @staticmethod
+    def _make_value(column_type: str, index: int) -> str:
+        if column_type == 'uuid':
+            return str(uuid.UUID(int=index + 1))
+        if column_type == 'integer':
+            return str(index)
+        if column_type == 'real':
+            return f'{index % 1000}.5'
+        if column_type == 'boolean':
+            return 'True' if index % 2 else 'False'
+        return f'value_{index}'
+
+    def _make_row(self, columns: dict, attributes: list, index: int, variant: int = 0) -> dict:
+        row: dict = {}
+
+        for column_name, column_type in columns.items():
+            if column_name in attributes:
+                # composite keys spread rows over the first attribute to keep keys unique
+                value_index: int = index
+                if len(attributes) > 1:
+                    value_index = index % 64 if attributes.index(column_name) == 0 else index // 64
+                row[column_name] = self._make_value(column_type, value_index)
+            else:
+                row[column_name] = self._make_value(column_type, index + variant)
+
+        return row
+
+    @staticmethod
+    def _write_table(f: object, table_name: str, columns: dict, rows: list) -> None:
+        f.write('<?xml version="1.0" encoding="us-ascii"?>\n')
+        f.write('<database name="hammerheart">\n')
+        f.write(f'\t<table name="{table_name}" version="1">\n')
+        f.write('\t\t<header>\n')
+
+        for column_name, column_type in columns.items():
+            f.write(f'\t\t\t<column name="{column_name}" type="{column_type}" />\n')
+
+        f.write('\t\t</header>\n')
+        f.write('\t\t<rows>\n')
+
+        for row in rows:
+            f.write('\t\t\t<row %s />\n' % ' '.join(f'{key}="{value}"' for key, value in row.items()))
+
+        f.write('\t\t</rows>\n')
+        f.write('\t</table>\n')
+        f.write('</database>\n')
+
+    @staticmethod
+    def _write_localization(f: object, rows: list) -> None:
+        f.write('<Table>\n')
+
+        for cells in rows:
+            f.write('\t<Row>%s</Row>\n' % ''.join(f'<Cell>{cell}</Cell>' for cell in cells))
+
+        f.write('</Table>\n')
+
+    def _pick_project_indexes(self, row_count: int) -> list:
+        project_row_count: int = max(1, int(row_count * self.project_ratio))
+        return sorted(random.Random(row_count).sample(range(row_count), project_row_count))
+
+    def _generate_fixture(self, row_count: int) -> tuple:
+        """Generates a fake game install and a project that patches it. Returns (game path, manifest path)."""
+        scale_path: str = os.path.join(self.fixture_path, str(row_count))
+        game_path: str = os.path.join(scale_path, 'game')
+        project_path: str = os.path.join(scale_path, 'project')
+        manifest_path: str = os.path.join(project_path, 'mod.manifest')
+
+        if os.path.exists(manifest_path):
+            shutil.rmtree(os.path.join(project_path, 'Build'), ignore_errors=True)
+            return game_path, manifest_path
+
+        Benchmark.log.info(f'Generating fixture with {row_count} rows: "{scale_path}"')
+
+        project_indexes: list = self._pick_project_indexes(row_count)
+
+        os.makedirs(os.path.join(game_path, 'Data'), exist_ok=True)
+
+        with zipfile.ZipFile(os.path.join(game_path, 'Data', 'Tables.pak'), 'w', zipfile.ZIP_DEFLATED) as game_pak:
+            for arcname, columns in self.tables.items():
+                signature: dict = self.signatures[f'Data/{arcname}']
+                attributes: list = signature['attributes']
+                table_name: str = os.path.splitext(os.path.basename(arcname))[0]
+
+                with io.TextIOWrapper(game_pak.open(arcname, 'w', force_zip64=True), encoding='utf-8') as f:
+                    self._write_table(f, table_name, columns,
+                                      (self._make_row(columns, attributes, i) for i in range(row_count)))
+
+                # half of the project rows are identical to the game, and half are changed
+                project_rows: list = [self._make_row(columns, attributes, i, variant=i % 2) for i in project_indexes]
+
+                project_xml_path: str = os.path.join(project_path, 'Data', *arcname.split('/'))
+                os.makedirs(os.path.dirname(project_xml_path), exist_ok=True)
+
+                with open(project_xml_path, 'w', encoding='utf-8') as f:
+                    self._write_table(f, table_name, columns, project_rows)
+
+        os.makedirs(os.path.join(game_path, 'Localization'), exist_ok=True)
+
+        with zipfile.ZipFile(os.path.join(game_path, 'Localization', 'english_xml.pak'), 'w', zipfile.ZIP_DEFLATED) as game_pak:
+            for arcname in self.localization:
+                with io.TextIOWrapper(game_pak.open(arcname, 'w', force_zip64=True), encoding='utf-8') as f:
+                    self._write_localization(f, ((f'ui_key_{i}', f'Source {i}', f'Text {i}') for i in range(row_count)))
+
+                project_rows = [(f'ui_key_{i}', f'Source {i}' if i % 2 else f'Changed {i}') for i in project_indexes]
+
+                project_xml_path = os.path.join(project_path, 'Localization', 'english_xml', arcname)
+                os.makedirs(os.path.dirname(project_xml_path), exist_ok=True)
+
+                with open(project_xml_path, 'w', encoding='utf-8') as f:
+                    self._write_localization(f, project_rows)
+
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+            f.write(f'<kcd_mod><info><name>Benchmark {row_count}</name><version>1.0</version></info></kcd_mod>\n')
+
+        return game_path, manifest_path
+
+    def _create_settings(self, game_path: str, manifest_path: str) -> object:
+        from modsmith.__main__ import create_parser
+
+        args: argparse.Namespace = create_parser().parse_args([manifest_path, '--game-path', game_path] + self.modsmith_args)
+
+        return self.modsmith.ProjectSettings(self.modsmith.ProjectOptions(args))
+
+    def _time(self, results: dict, name: str, function: object, *args: object) -> None:
+        output = contextlib.nullcontext() if self.verbose else self.modsmith.SimpleLogger.capture()
+
+        with output:
+            started: float = time.perf_counter()
+            function(*args)
+            elapsed: float = time.perf_counter() - started
+
+        results[name] = elapsed
+        Benchmark.log.info(f'{name}: {elapsed:.3f}s')
+
+    def _time_startup(self) -> float:
+        """Returns the median time to start a new interpreter, import modsmith and create its parser"""
+        timings: list = []
+
+        for _ in range(self.startup_runs):
+            started: float = time.perf_counter()
+            subprocess.run([sys.executable, '-c', self.startup_code, self.root_path], check=True)
+            timings.append(time.perf_counter() - started)
+
+        elapsed: float = statistics.median(timings)
+        Benchmark.log.info(f'startup: {elapsed:.3f}s (median of {self.startup_runs} runs)')
+
+        return elapsed
+
+    def _run_scale(self, row_count: int) -> dict:
+        game_path, manifest_path = self._generate_fixture(row_count)
+        settings = self._create_settings(game_path, manifest_path)
+
+        project_data_files: list = [os.path.join(settings.project_data_path, *arcname.split('/')) for arcname in self.tables]
+        project_i18n_files: list = [os.path.join(settings.project_i18n_path, 'english_xml', arcname) for arcname in self.localization]
+
+        results: dict = {}
+
+        Benchmark.log.info(f'Benchmarking {row_count} rows...')
+
+        self._time(results, 'patch_data', self.modsmith.Patcher(settings).patch_data, project_data_files)
+        self._time(results, 'patch_localization', self.modsmith.Patcher(settings).patch_localization, project_i18n_files)
+
+        shutil.rmtree(settings.project_build_path, ignore_errors=True)
+
+        packager = self.modsmith.Packager(settings)
+
+        self._time(results, 'generate_pak', packager.generate_pak)
+        self._time(results, 'generate_i18n', packager.generate_i18n)
+        self._time(results, 'pack', packager.pack)
+
+        return results
+
+    def run(self) -> int:
+        startup: float = self._time_startup()
+
+        results: dict = {}
+
+        for row_count in self.scales:
+            results[str(row_count)] = self._run_scale(row_count)
+
+        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+
+        with open(self.output_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'platform'     : sys.platform,
+                'python'       : sys.version,
+                'project_ratio': self.project_ratio,
+                'modsmith_args': self.modsmith_args,
+                'startup'      : startup,
+                'results'      : results
+            }, f, indent=2)
+
+        Benchmark.log.info(f'Wrote results: "{self.output_path}"')
+
+        if self.max_startup and startup > self.max_startup:
+            Benchmark.log.error(f'Startup took {startup:.3f}s, more than the {self.max_startup:.3f}s allowed')
+            return 1
+
+        return 0
+
+
+if __name__ == '__main__':
+    # configured here, so importing the module does not reconfigure logging for its importer
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname).4s] %(message)s')
+
+    _parser = argparse.ArgumentParser(description='Modsmith Benchmark Script')
+
+    _parser.add_argument('--rows',
+                         action='store', nargs='+', type=int, default=[10000, 100000, 500000],
+                         help='numbers of rows in each synthetic game table')
+
+    _parser.add_argument('--project-ratio',
+                         action='store', type=float, default=0.1,
+                         help='fraction of game rows included in the synthetic project')
+
+    _parser.add_argument('--fixture-path',
+                         action='store', default='bench_fixtures',
+                         help='path to generated game installs and projects, reused between runs')
+
+    _parser.add_argument('--output-path',
+                         action='store', default='bench_output.json',
+                         help='path to JSON results')
+
+    _parser.add_argument('--startup-runs',
+                         action='store', type=int, default=5,
+                         help='number of times modsmith is started to time cold start')
+
+    _parser.add_argument('--max-startup',
+                         action='store', type=float, default=0,
+                         help='fail when the median cold start takes longer than this many seconds, or 0 to not check')
+
+    _parser.add_argument('--verbose',
+                         action='store_true', default=False,
+                         help='print modsmith log output')
+
+    _parser.add_argument('modsmith_args',
+                         nargs=argparse.REMAINDER,
+                         help='arguments passed to modsmith after --, e.g. -- --no-cache --jobs 4')
+
+    _args = _parser.parse_args()
+
+    if _args.modsmith_args[:1] == ['--']:
+        _args.modsmith_args = _args.modsmith_args[1:]
+
+    sys.exit(Benchmark(_args).run())
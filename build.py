@@ -124,7 +124,7 @@ class Application:
             '--python-flag=nosite',
             f'--python-for-scons={sys.executable}',
             '--assume-yes-for-downloads',
-            # '--plugin-enable=multiprocessing',
+            '--plugin-enable=multiprocessing',
             '--show-progress',
             '--file-reference-choice=runtime'
         ]
@@ -0,0 +1,14 @@
+import importlib.util
+import os
+import sys
+
+# the package folder is named Modsmith, which cannot be imported as modsmith on case-sensitive file systems
+try:
+    import modsmith
+except ImportError:
+    _package_path: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Modsmith')
+
+    _spec = importlib.util.spec_from_file_location('modsmith', os.path.join(_package_path, '__init__.py'),
+                                                   submodule_search_locations=[_package_path])
+    sys.modules['modsmith'] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules['modsmith'])
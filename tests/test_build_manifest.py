@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+import unittest
+
+from modsmith import BuildManifest
+
+
+class BuildManifestTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.build_path: str = self._temp_dir.name
+        self.manifest_path: str = os.path.join(self.build_path, 'manifest.json')
+
+        self.source_path: str = os.path.join(self.build_path, 'armor.xml')
+        self.output_path: str = os.path.join(self.build_path, 'Data', 'armor.xml')
+
+        self._write(self.source_path, b'<table/>')
+        self._write(self.output_path, b'<table/>')
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    @staticmethod
+    def _write(file_path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        with open(file_path, 'wb') as f:
+            f.write(data)
+
+    def _make_fingerprint(self, diff_version: int = 1) -> dict:
+        return BuildManifest.make_fingerprint(self.source_path, 0x1234, ('Armor', ('id',)), diff_version)
+
+    def _save_entry(self) -> None:
+        manifest = BuildManifest(self.manifest_path, self.build_path)
+        manifest.update('Data/armor.xml', self._make_fingerprint(), self.output_path)
+        manifest.save()
+
+    def _load(self) -> BuildManifest:
+        manifest = BuildManifest(self.manifest_path, self.build_path)
+        manifest.load()
+        return manifest
+
+    def test_round_trip(self) -> None:
+        self._save_entry()
+
+        self.assertTrue(self._load().is_current('Data/armor.xml', self._make_fingerprint(), self.output_path))
+
+    def test_changed_source_is_not_current(self) -> None:
+        self._save_entry()
+        self._write(self.source_path, b'<table name="armor"/>')
+
+        self.assertFalse(self._load().is_current('Data/armor.xml', self._make_fingerprint(), self.output_path))
+
+    def test_changed_diff_version_is_not_current(self) -> None:
+        self._save_entry()
+
+        self.assertFalse(self._load().is_current('Data/armor.xml', self._make_fingerprint(2), self.output_path))
+
+    def test_missing_output_is_not_current(self) -> None:
+        self._save_entry()
+        os.remove(self.output_path)
+
+        self.assertFalse(self._load().is_current('Data/armor.xml', self._make_fingerprint(), self.output_path))
+
+    def test_unreadable_manifest_rebuilds_everything(self) -> None:
+        self._save_entry()
+
+        with open(self.manifest_path, 'rb') as f:
+            data: bytes = f.read()
+
+        manifest: dict = json.loads(data)
+        manifest['version'] = BuildManifest.VERSION - 1
+
+        for name, manifest_data in (('old version', json.dumps(manifest).encode('utf-8')),
+                                    ('truncated', data[:len(data) // 2])):
+            with self.subTest(name):
+                self._write(self.manifest_path, manifest_data)
+
+                self.assertFalse(self._load().is_current('Data/armor.xml', self._make_fingerprint(), self.output_path))
+
+    def test_prune_removes_stale_outputs(self) -> None:
+        self._save_entry()
+
+        manifest: BuildManifest = self._load()
+        manifest.prune('Data/', set())
+
+        self.assertEqual(manifest.entries, {})
+        self.assertFalse(os.path.exists(self.output_path))
+
+    def test_file_crcs_are_kept_until_the_file_changes(self) -> None:
+        stamp: list = BuildManifest.make_stamp(self.source_path)
+
+        manifest = BuildManifest(self.manifest_path, self.build_path)
+
+        # a file changed within the last clock tick could change again without changing its stamp
+        manifest.update_file_crc(self.source_path, stamp, 0x1234)
+        self.assertIsNone(manifest.get_file_crc(self.source_path, stamp))
+
+        old_stamp: list = [stamp[0], 1_000_000_000, 1_000_000_000]
+        manifest.update_file_crc(self.source_path, old_stamp, 0x1234)
+        manifest.save()
+
+        self.assertEqual(self._load().get_file_crc(self.source_path, old_stamp), 0x1234)
+        self.assertIsNone(self._load().get_file_crc(self.source_path, stamp))
+
+
+if __name__ == '__main__':
+    unittest.main()
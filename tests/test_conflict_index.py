@@ -0,0 +1,39 @@
+import argparse
+import tempfile
+import unittest
+
+from modsmith import ConflictIndex
+
+
+class ConflictIndexTest(unittest.TestCase):
+    def test_find_conflicts(self) -> None:
+        armor: str = 'Libs/Tables/item/armor.xml'
+
+        records: dict = {
+            'hoods' : {'Data/Libs/Tables/item/armor.xml'   : (None, armor, {('1',): {'Name', 'Weight'}}),
+                       'Data/Libs/Tables/item/armor__2.xml': (None, armor, {('1',): {'Name'}})},
+            'armor' : {'Data/Libs/Tables/item/armor.xml': (None, armor, {('1',): {'Weight'}, ('2',): {'Name'}})},
+            'prices': {'Data/Libs/Tables/item/weapon.xml': (None, 'Libs/Tables/item/weapon.xml', {('1',): {'Weight'}})}
+        }
+
+        # a project patching the same attribute in two files does not conflict with itself
+        self.assertEqual(ConflictIndex.find_conflicts(records),
+                         {(armor, ('1',), 'Weight'): ['hoods', 'armor']})
+
+    def test_record_is_discarded_when_inputs_change(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            conflict_index = ConflictIndex(argparse.Namespace(no_cache=False), [])
+            conflict_index.index_path = temp_dir
+
+            record: dict = {'Data/Libs/Tables/item/armor.xml': ((8, 0, 0x1234), 'Libs/Tables/item/armor.xml', {})}
+            conflict_index._write_record('Hoods', (2, 'a0b1'), record)
+
+            self.assertEqual(conflict_index._read_record('Hoods', (2, 'a0b1')), record)
+
+            # the diff rules or kingdomcome.yaml changed since the record was written
+            self.assertEqual(conflict_index._read_record('Hoods', (3, 'a0b1')), {})
+            self.assertEqual(conflict_index._read_record('Hoods', (2, 'c2d3')), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
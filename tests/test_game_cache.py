@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+import zipfile
+from typing import (Callable,
+                    Generator,
+                    IO)
+from unittest import mock
+
+from modsmith import (GameCache,
+                      GamePak,
+                      Patcher,
+                      SharedIndex)
+
+
+class GameCacheTest(unittest.TestCase):
+    TABLE: bytes = b'<table><rows><row id="1" Name="hood"/><row id="2" Name="cap"/><row id="2" Name="cowl"/></rows></table>'
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.game_pak_path: str = os.path.join(self._temp_dir.name, 'Tables.pak')
+        self.cache_path: str = os.path.join(self._temp_dir.name, 'tables')
+
+        with zipfile.ZipFile(self.game_pak_path, 'w') as zip_file:
+            zip_file.writestr('Libs/Tables/item/armor.xml', self.TABLE)
+
+        self.game_pak: GamePak = GamePak(self.game_pak_path)
+
+    def tearDown(self) -> None:
+        self.game_pak.close()
+        self._temp_dir.cleanup()
+
+    @staticmethod
+    def _iterate(game_xml: IO) -> Generator:
+        return Patcher.iter_rows(game_xml, 'row', ['id'])
+
+    def _load(self, iterate: Callable = None) -> tuple:
+        game_cache = GameCache(self.cache_path)
+        return game_cache.load(self.game_pak, self.game_pak_path, 'Libs/Tables/item/armor.xml', ('row', ('id',)),
+                               iterate or self._iterate)
+
+    def _write_cache_file(self) -> None:
+        game_cache = GameCache(self.cache_path)
+        key: tuple = game_cache.get_key(self.game_pak_path, 'Libs/Tables/item/armor.xml', ('row', ('id',)))
+
+        with self.game_pak.open_mapped('Libs/Tables/item/armor.xml') as f:
+            buffer: bytearray = SharedIndex.pack(self._iterate(f))
+
+        game_cache._write(key, game_cache.get_stamp(self.game_pak, 'Libs/Tables/item/armor.xml'), buffer)
+
+    def test_index_is_read_from_cache_file(self) -> None:
+        index, duplicate_keys = self._load()
+
+        self.assertEqual(index[('1',)], {'id': '1', 'Name': 'hood'})
+        self.assertEqual(duplicate_keys, frozenset({('2',)}))
+
+        iterate = mock.Mock(side_effect=self._iterate)
+        index, _ = self._load(iterate)
+
+        iterate.assert_not_called()
+        self.assertEqual(index[('2',)], {'id': '2', 'Name': 'cap'})
+
+    def test_cache_file_of_another_version_is_rebuilt(self) -> None:
+        self._load()
+
+        # an index packed by an older release, left in the cache
+        with mock.patch.object(SharedIndex, 'VERSION', SharedIndex.VERSION - 1):
+            self._write_cache_file()
+
+        iterate = mock.Mock(side_effect=self._iterate)
+        index, _ = self._load(iterate)
+
+        iterate.assert_called_once()
+        self.assertEqual(index[('1',)], {'id': '1', 'Name': 'hood'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+from modsmith import GameConfig
+
+
+class GameConfigTest(unittest.TestCase):
+    CONFIG: bytes = b'''---
+Exclusions:
+ - .tbl
+ - Data/Libs/AI
+ - Data/Libs/Compatibility.xml
+
+Localization:
+ - text_ui_items.xml
+
+Packages:
+ Data/Libs: Libs.pak
+ Data/Libs/Tables: Tables.pak
+
+Signatures:
+ - Data/Libs/Tables/item/armor.xml:
+   - element: row
+     attributes:
+     - armor_id
+ - armor.xml:
+   - element: armor
+     attributes:
+     - id
+ - Data/Libs/Tables/item/armor.xml:
+   - element: row
+     attributes:
+     - name
+'''
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        config_path: str = os.path.join(self._temp_dir.name, 'kingdomcome.yaml')
+
+        with open(config_path, 'wb') as f:
+            f.write(self.CONFIG)
+
+        self.config: GameConfig = GameConfig(config_path)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def test_find_package_by_longest_prefix(self) -> None:
+        self.assertEqual(self.config.find_package('Data/Libs/Tables/item/armor.xml'), 'Tables.pak')
+        self.assertEqual(self.config.find_package('Data/Libs/UI/menu.xml'), 'Libs.pak')
+        self.assertEqual(self.config.find_package('Data/Libs'), 'Libs.pak')
+
+        # paths match whole segments, not string prefixes
+        self.assertIsNone(self.config.find_package('Data/LibsExtra/armor.xml'))
+        self.assertIsNone(self.config.find_package('Data/Scripts/armor.lua'))
+
+    def test_find_signature_by_longest_suffix(self) -> None:
+        # the first of two entries for the same path wins
+        self.assertEqual(self.config.find_signature('C:/Mods/Hoods/Data/Libs/Tables/item/armor.xml'), ('row', ['armor_id']))
+        self.assertEqual(self.config.find_signature('Data/Libs/Tables/item/armor.xml'), ('row', ['armor_id']))
+
+        self.assertEqual(self.config.find_signature('Data/Libs/Items/armor.xml'), ('armor', ['id']))
+        self.assertIsNone(self.config.find_signature('Data/Libs/Tables/item/weapon.xml'))
+        self.assertIsNone(self.config.find_signature('Data/Libs/Tables/item/my_armor.xml'))
+
+    def test_excluded_extensions(self) -> None:
+        self.assertTrue(self.config.is_excluded('Data/Libs/Tables/item/armor.tbl'))
+        self.assertTrue(self.config.is_excluded('Data/Libs/Tables/item/ARMOR.TBL'))
+        self.assertFalse(self.config.is_excluded('Data/Libs/Tables/item/armor.tbl.xml'))
+
+    def test_excluded_paths(self) -> None:
+        self.assertTrue(self.config.is_excluded('Data/Libs/AI/behavior.xml'))
+        self.assertTrue(self.config.is_excluded('Data/Libs/Compatibility.xml'))
+
+        # paths match whole segments, ignoring case
+        self.assertTrue(self.config.is_excluded('data/libs/ai/Behavior.xml'))
+        self.assertFalse(self.config.is_excluded('Data/Libs/AIBrain/behavior.xml'))
+        self.assertFalse(self.config.is_excluded('Data/Libs/Tables/item/armor.xml'))
+
+
+if __name__ == '__main__':
+    unittest.main()
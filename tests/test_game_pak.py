@@ -0,0 +1,129 @@
+import os
+import struct
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+from modsmith import (GamePak,
+                      GamePakIndex,
+                      SimpleLogger as Log)
+
+
+class GamePakTest(unittest.TestCase):
+    MEMBERS: dict = {
+        'Libs/Tables/item/armor.xml'    : b'<table name="armor"/>' * 64,
+        'Libs/Tables/item/weapon.xml'   : b'<table name="weapon"/>',
+        'Libs/Tables/shop/shop_type.xml': b''
+    }
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.game_pak_path: str = os.path.join(self._temp_dir.name, 'Tables.pak')
+        self.index_path: str = os.path.join(self._temp_dir.name, 'paks')
+
+        # members are written out of name order, and both stored and deflated
+        with zipfile.ZipFile(self.game_pak_path, 'w') as zip_file:
+            for i, (name, data) in enumerate(reversed(self.MEMBERS.items())):
+                zip_file.writestr(name, data, zipfile.ZIP_DEFLATED if i % 2 else zipfile.ZIP_STORED)
+
+        self.stamp: tuple = (os.path.getsize(self.game_pak_path), os.stat(self.game_pak_path).st_mtime_ns)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def _read_members(self) -> dict:
+        game_pak = GamePak(self.game_pak_path, self.index_path)
+
+        try:
+            members: dict = {}
+
+            for name in self.MEMBERS:
+                with game_pak.open_mapped(name) as f:
+                    members[name] = f.read()
+
+            return members
+        finally:
+            game_pak.close()
+
+    def test_members_are_read_by_offset(self) -> None:
+        self.assertEqual(self._read_members(), self.MEMBERS)
+
+        game_pak = GamePak(self.game_pak_path, self.index_path)
+
+        try:
+            self.assertEqual(game_pak.getinfo('Libs/Tables/item/weapon.xml').compress_type, zipfile.ZIP_DEFLATED)
+
+            with self.assertRaises(KeyError):
+                game_pak.getinfo('Libs/Tables/item/helmet.xml')
+        finally:
+            game_pak.close()
+
+    def test_close_closes_open_members(self) -> None:
+        game_pak = GamePak(self.game_pak_path, self.index_path)
+
+        stored_file = game_pak.open_mapped('Libs/Tables/item/armor.xml')
+        deflated_file = game_pak.open_mapped('Libs/Tables/item/weapon.xml')
+        stored_file.readinto(bytearray(8))
+
+        # the map is closed, rather than left to the members still holding it
+        game_pak.close()
+
+        self.assertIsNone(game_pak._mapping)
+
+        for member_file in (stored_file, deflated_file):
+            with self.assertRaises(ValueError):
+                member_file.read()
+
+    def test_close_while_a_member_is_read(self) -> None:
+        game_pak = GamePak(self.game_pak_path, self.index_path)
+        mapping = game_pak._get_mapping()
+
+        # a view held by a read in progress on another thread
+        view = memoryview(mapping)
+
+        with mock.patch.object(Log, 'debug') as debug:
+            game_pak.close()
+
+        debug.assert_called_once()
+
+        view.release()
+        mapping.close()
+
+    def test_index_file_is_reused_only_for_the_same_game_pak(self) -> None:
+        index: GamePakIndex = GamePakIndex.build(self.game_pak_path)
+        index_file_path: str = os.path.join(self.index_path, 'Tables.index')
+        index.write(index_file_path, self.stamp)
+
+        read_index: GamePakIndex = GamePakIndex.read(index_file_path, self.stamp)
+
+        self.assertEqual(read_index.names, sorted(self.MEMBERS))
+        self.assertEqual(read_index.find('Libs/Tables/item/weapon.xml'), 1)
+        self.assertEqual(read_index.find('Libs/Tables/item/helmet.xml'), -1)
+
+        for name in ('header_offsets', 'compress_sizes', 'file_sizes', 'crcs', 'compress_types'):
+            self.assertEqual(getattr(read_index, name), getattr(index, name), name)
+
+        # a game update changes the stamp, and an index written by another version has a different layout
+        self.assertIsNone(GamePakIndex.read(index_file_path, (self.stamp[0] + 1, self.stamp[1])))
+
+        with open(index_file_path, 'r+b') as f:
+            f.seek(len(GamePakIndex.MAGIC))
+            f.write(struct.pack('<I', GamePakIndex.VERSION - 1))
+
+        self.assertIsNone(GamePakIndex.read(index_file_path, self.stamp))
+
+    def test_truncated_index_file_is_discarded(self) -> None:
+        # the first reader writes the index file
+        self._read_members()
+
+        index_file_path: str = os.path.join(self.index_path, os.listdir(self.index_path)[0])
+
+        with open(index_file_path, 'r+b') as f:
+            f.truncate(os.path.getsize(index_file_path) - 1)
+
+        self.assertIsNone(GamePakIndex.read(index_file_path, self.stamp))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import os
+import tempfile
+import time
+import unittest
+import zipfile
+from unittest import mock
+
+from lxml import etree
+
+from modsmith import (Packager,
+                      ProjectOptions,
+                      ProjectSettings)
+from modsmith.__main__ import create_parser
+
+
+class PackagerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.project_path: str = os.path.join(self._temp_dir.name, 'Test Mod')
+        self.game_path: str = os.path.join(self._temp_dir.name, 'Game')
+
+        self._write(os.path.join(self.project_path, 'mod.manifest'),
+                    b'<kcd_mod><info><name>Test Mod</name><version>1.0</version></info></kcd_mod>')
+        os.makedirs(self.game_path)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    @staticmethod
+    def _write(file_path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        with open(file_path, 'wb') as f:
+            f.write(data)
+
+    def _make_packager(self, *args: str) -> Packager:
+        options = ProjectOptions(create_parser().parse_args([os.path.join(self.project_path, 'mod.manifest'),
+                                                             '--game-path', self.game_path, '--no-cache', *args]))
+        return Packager(ProjectSettings(options))
+
+
+class WritePakTest(PackagerTest):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.asset_path: str = os.path.join(self.project_path, 'Data', 'Textures', 'hood.dds')
+        self._write(self.asset_path, b'DDS hood')
+
+        self.packager: Packager = self._make_packager('--incremental')
+        self.pak_path: str = self.packager.settings.build_package_path
+
+    def _write_pak(self, table_data: bytes = b'<table/>') -> None:
+        def write_text(target) -> None:
+            target.write(b'<Table/>')
+
+        self.packager._write_pak(self.pak_path, [(self.asset_path, 'Textures/hood.dds', None),
+                                                 ('', 'Libs/Tables/item/armor__test_mod.xml', table_data),
+                                                 ('', 'Localization/text__test_mod.xml', write_text)])
+
+    def _read_pak(self) -> dict:
+        with zipfile.ZipFile(self.pak_path) as zip_file:
+            return {name: zip_file.read(name) for name in zip_file.namelist()}
+
+    def test_unchanged_pak_is_kept(self) -> None:
+        self._write_pak()
+        stat: os.stat_result = os.stat(self.pak_path)
+
+        self._write_pak()
+
+        self.assertEqual((os.stat(self.pak_path).st_ino, os.stat(self.pak_path).st_mtime_ns), (stat.st_ino, stat.st_mtime_ns))
+        self.assertFalse(os.path.exists(self.pak_path + '.tmp'))
+
+    def test_changed_member_is_written_and_others_copied(self) -> None:
+        self._write_pak()
+
+        with mock.patch.object(Packager, '_write_file', wraps=Packager._write_file) as write_file:
+            self._write_pak(b'<table name="armor"/>')
+
+        write_file.assert_not_called()
+
+        self.assertEqual(self._read_pak(), {
+            'Textures/hood.dds'                   : b'DDS hood',
+            'Libs/Tables/item/armor__test_mod.xml': b'<table name="armor"/>',
+            'Localization/text__test_mod.xml'     : b'<Table/>'
+        })
+
+    def test_recorded_crc_is_not_read_again(self) -> None:
+        self._write_pak()
+
+        # files are only recorded once they are older than a clock tick, so the clock is moved forward
+        with mock.patch('time.time_ns', return_value=time.time_ns() + 10_000_000_000):
+            self._write_pak()
+
+        with mock.patch.object(Packager, '_crc32_file', wraps=Packager._crc32_file) as crc32_file:
+            self._write_pak()
+
+        crc32_file.assert_not_called()
+
+    def test_replaced_file_with_older_mtime_is_read_again(self) -> None:
+        self._write_pak()
+
+        with mock.patch('time.time_ns', return_value=time.time_ns() + 10_000_000_000):
+            self._write_pak()
+
+        stat: os.stat_result = os.stat(self.asset_path)
+
+        # file times are as coarse as a kernel clock tick
+        time.sleep(0.02)
+
+        # same size and modified time, as when a file is restored from a backup
+        self._write(self.asset_path, b'DDS cowl')
+        os.utime(self.asset_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self._write_pak()
+
+        self.assertEqual(self._read_pak()['Textures/hood.dds'], b'DDS cowl')
+
+
+class GenerateI18nTest(PackagerTest):
+    @staticmethod
+    def _make_table(*rows: tuple) -> bytes:
+        cells: str = ''.join('<Row>%s</Row>' % ''.join(f'<Cell>{text}</Cell>' for text in row) for row in rows)
+        return f'<Table>{cells}</Table>'.encode('utf-8')
+
+    def setUp(self) -> None:
+        super().setUp()
+
+        os.makedirs(os.path.join(self.game_path, 'Localization'))
+
+        with zipfile.ZipFile(os.path.join(self.game_path, 'Localization', 'english_xml.pak'), 'w') as zip_file:
+            zip_file.writestr('text_ui_items.xml', self._make_table(('ui_nm_hood', 'Hood', 'Hood')))
+            zip_file.writestr('text_ui_menus.xml', self._make_table(('ui_menu_start', 'Start', 'Start')))
+
+        localization_path: str = os.path.join(self.project_path, 'Localization', 'english_xml')
+
+        # written in reverse name order, so directory order is less likely to match name order
+        self._write(os.path.join(localization_path, 'text_ui_menus.xml'),
+                    self._make_table(('ui_menu_start', 'Begin'), ('ui_menu_quit', 'Quit')))
+        self._write(os.path.join(localization_path, 'text_ui_items.xml'),
+                    self._make_table(('ui_nm_hood', 'Cowl'), ('ui_nm_cap', 'Cap')))
+
+    def _read_merged_keys(self, packager: Packager) -> list:
+        lang_pak_path: str = os.path.join(packager.settings.build_localization_path, 'english_xml.pak')
+
+        with zipfile.ZipFile(lang_pak_path) as zip_file:
+            root: etree._Element = etree.fromstring(zip_file.read('text__test_mod.xml'))
+
+        return [row[0].text for row in root]
+
+    def test_rows_are_merged_in_file_name_order(self) -> None:
+        for args in ((), ('--keep-build-tree',)):
+            with self.subTest(args=args):
+                packager: Packager = self._make_packager(*args)
+                packager.generate_i18n()
+
+                self.assertEqual(self._read_merged_keys(packager), ['ui_nm_hood', 'ui_nm_cap', 'ui_menu_start', 'ui_menu_quit'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from decimal import Decimal
+
+from lxml import etree
+
+from modsmith import Patcher
+
+
+class NormalizeTest(unittest.TestCase):
+    def test_numbers_compare_by_value(self) -> None:
+        self.assertEqual(Patcher.normalize_number('1'), Patcher.normalize_number('1.00'))
+        self.assertEqual(Patcher.normalize_number('-0.5'), Decimal('-0.5'))
+        self.assertNotEqual(Patcher.normalize_number('1'), Patcher.normalize_number('1.01'))
+
+    def test_other_values_compare_as_text(self) -> None:
+        self.assertEqual(Patcher.normalize_number('one'), 'one')
+        self.assertEqual(Patcher.normalize_number(''), '')
+
+        # NaN is never equal to itself, so it must stay text to match an identical game value
+        self.assertEqual(Patcher.normalize_number('NaN'), 'NaN')
+
+    def test_normalizer_by_column_type(self) -> None:
+        self.assertIs(Patcher.get_normalizer('integer'), Patcher.normalize_number)
+        self.assertIs(Patcher.get_normalizer('real'), Patcher.normalize_number)
+        self.assertEqual(Patcher.get_normalizer('uuid')('A0B1'), 'a0b1')
+        self.assertEqual(Patcher.get_normalizer('boolean')('True'), 'true')
+        self.assertIsNone(Patcher.get_normalizer('string'))
+        self.assertIsNone(Patcher.get_normalizer(None))
+
+
+class FindChangedAttributesTest(unittest.TestCase):
+    TABLE: bytes = b'''<database><table name="armor">
+        <header>
+            <column name="armor_id" type="uuid"/>
+            <column name="Weight" type="real"/>
+            <column name="Price" type="integer"/>
+            <column name="is_visible" type="boolean"/>
+            <column name="Name" type="string"/>
+        </header>
+        <rows>
+            <row armor_id="A0B1" Weight="2.50" Price="10" is_visible="True" Name="1.0"/>
+            <row armor_id="c2d3" Weight="3" Name="cowl"/>
+            <row armor_id="e4f5" Weight="1"/>
+        </rows>
+    </table></database>'''
+
+    def setUp(self) -> None:
+        tree: etree.ElementTree = etree.ElementTree(etree.fromstring(self.TABLE))
+
+        self.column_types: dict = Patcher.get_column_types(tree)
+        self.project_rows: list = tree.xpath('//row')
+
+    def test_column_types_are_keyed_by_lowercase_name(self) -> None:
+        self.assertEqual(self.column_types['weight'], 'real')
+        self.assertEqual(self.column_types['name'], 'string')
+
+    def test_equal_values_by_column_type(self) -> None:
+        game_rows: list = [
+            {'armor_id': 'a0b1', 'Weight': '2.5', 'Price': '10.0', 'is_visible': 'true', 'Name': '1.0'},
+            {'armor_id': 'c2d3', 'Weight': '3.0', 'Name': 'cowl', 'Price': '5'},
+            {'armor_id': 'e4f5', 'Weight': '1'}
+        ]
+
+        changed: list = Patcher.find_changed_attributes(self.project_rows, game_rows, self.column_types)
+
+        # attributes only in the game row are not patched
+        self.assertEqual(changed, [set(), set(), set()])
+        self.assertEqual(Patcher.find_changed_rows(self.project_rows, game_rows, self.column_types), bytearray(3))
+
+    def test_changed_and_missing_values(self) -> None:
+        game_rows: list = [
+            {'armor_id': 'a0b1', 'Weight': '2.51', 'Price': '10', 'is_visible': 'false', 'Name': '1'},
+            {'armor_id': 'c2d3', 'Weight': '3'},
+            None
+        ]
+
+        changed: list = Patcher.find_changed_attributes(self.project_rows, game_rows, self.column_types)
+
+        # string columns compare as text, and rows new to the game patch every attribute
+        self.assertEqual(changed, [{'Weight', 'is_visible', 'Name'}, {'Name'}, {'armor_id', 'Weight'}])
+        self.assertEqual(Patcher.find_changed_rows(self.project_rows, game_rows, self.column_types), bytearray([1, 1, 1]))
+
+    def test_untyped_columns_compare_as_text(self) -> None:
+        game_rows: list = [{'armor_id': 'A0B1', 'Weight': '2.5', 'Price': '10', 'is_visible': 'True', 'Name': '1.0'}]
+
+        changed: list = Patcher.find_changed_attributes(self.project_rows[:1], game_rows, {})
+
+        self.assertEqual(changed, [{'Weight'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
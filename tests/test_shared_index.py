@@ -0,0 +1,128 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from modsmith import SharedIndex
+
+
+class SharedIndexTest(unittest.TestCase):
+    ITEMS: list = [
+        (('Armor', 'helmet_01'), {'Name': 'helmet_01', 'Weight': '2'}),
+        (('Armor', None), {'Name': 'unnamed'}),
+        ('ui_armor_helmet', ('Helmet', 'Helm')),
+        ('ui_armor_hélm', ('Hélm', 'Helm')),
+        (('Armor', 'helmet_01'), {'Name': 'helmet_01', 'Weight': '3'})
+    ]
+
+    def setUp(self) -> None:
+        self.buffer: bytearray = SharedIndex.pack(self.ITEMS)
+
+    def _assert_items(self, index: SharedIndex) -> None:
+        self.assertEqual(len(index), 4)
+        self.assertEqual(set(index), {key for key, _ in self.ITEMS})
+        self.assertEqual(index.duplicate_keys, frozenset({('Armor', 'helmet_01')}))
+
+        # the first value of a duplicate key is kept
+        self.assertEqual(index[('Armor', 'helmet_01')], {'Name': 'helmet_01', 'Weight': '2'})
+        self.assertEqual(index[('Armor', None)], {'Name': 'unnamed'})
+        self.assertEqual(index['ui_armor_hélm'], ('Hélm', 'Helm'))
+
+        self.assertNotIn(('Armor', 'helmet_02'), index)
+        self.assertIsNone(index.get('ui_armor_boots'))
+
+        with self.assertRaises(KeyError):
+            _ = index['ui_armor_boots']
+
+    def test_lookup(self) -> None:
+        index = SharedIndex(self.buffer)
+
+        try:
+            self._assert_items(index)
+        finally:
+            index.close()
+
+        index = SharedIndex(SharedIndex.pack([]))
+
+        try:
+            self.assertEqual(list(index), [])
+            self.assertNotIn('ui_armor_helmet', index)
+        finally:
+            index.close()
+
+    def test_lookup_with_probing(self) -> None:
+        # enough keys that some share a slot of the hash table
+        items: list = [(('Row', str(i)), i) for i in range(1000)]
+        index = SharedIndex(SharedIndex.pack(items))
+
+        try:
+            self.assertEqual([index[key] for key, _ in items], list(range(1000)))
+            self.assertFalse(any(('Row', str(i)) in index for i in range(1000, 2000)))
+        finally:
+            index.close()
+
+    def test_published_index_is_attached_in_place(self) -> None:
+        block = SharedIndex.publish(self.buffer)
+
+        try:
+            index: SharedIndex = SharedIndex.attach(block.name)
+
+            try:
+                self._assert_items(index)
+                self.assertEqual(bytes(index.buffer), bytes(self.buffer))
+            finally:
+                index.close()
+        finally:
+            block.close()
+            block.unlink()
+
+    def test_mapped_file_is_closed_when_rejected(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path: str = os.path.join(temp_dir, 'armor.index')
+
+            # cached indexes follow a header, so they are mapped at an offset
+            with open(file_path, 'wb') as f:
+                f.write(b'header')
+                f.write(self.buffer)
+
+            index: SharedIndex = SharedIndex.map_file(file_path, len(b'header'), len(self.buffer))
+
+            try:
+                self._assert_items(index)
+            finally:
+                index.close()
+
+            with self.assertRaises(ValueError):
+                SharedIndex.map_file(file_path, len(b'header'), len(self.buffer) + 1)
+
+            with open(file_path, 'r+b') as f:
+                f.seek(len(b'header') + len(SharedIndex.MAGIC))
+                f.write(struct.pack('=I', SharedIndex.VERSION - 1))
+
+            with self.assertRaises(ValueError):
+                SharedIndex.map_file(file_path, len(b'header'), len(self.buffer))
+
+    def test_invalid_buffers_are_rejected(self) -> None:
+        old_version: bytearray = self.buffer[:]
+        struct.pack_into('=I', old_version, len(SharedIndex.MAGIC), SharedIndex.VERSION - 1)
+
+        # a hash table without an empty slot would never stop probing for missing keys
+        full_table: bytearray = self.buffer[:]
+        struct.pack_into('=Q', full_table, struct.calcsize('=4sIQ'), len(self.ITEMS) - 1)
+
+        buffers: dict = {
+            'old version'      : old_version,
+            'bad magic'        : b'MSPI' + self.buffer[4:],
+            'empty'            : b'',
+            'header only'      : self.buffer[:SharedIndex.HEADER.size],
+            'truncated'        : self.buffer[:-1],
+            'corrupt duplicate': self.buffer[:-2] + b'\xff\xff',
+            'full hash table'  : full_table
+        }
+
+        for name, buffer in buffers.items():
+            with self.subTest(name), self.assertRaises(ValueError):
+                SharedIndex(buffer)
+
+if __name__ == '__main__':
+    unittest.main()